@@ -0,0 +1,7 @@
+"""Medições de desempenho do Pulse, executadas fora do app (``python -m benchmarks.<nome>``)."""
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Páginas em views/, na ordem da navegação
+PAGES = ('home', 'general', 'tracks', 'albums', 'shows', 'related_artists', 'leaderboards')
@@ -0,0 +1,144 @@
+"""
+Latência de execução de cada página, comparada a uma referência gravada.
+
+Cada página de ``views/`` é executada sem navegador pelo ``AppTest`` do
+Streamlit, a partir de ``streamlit_app.py``, para uma lista fixa de artistas,
+usando apenas os arquivos de ``data/``. Para cada artista são medidas a
+primeira execução da página (cache de figuras ainda vazio para o artista) e as
+reexecuções seguintes. As fases são as mesmas medidas pelo app (``load``,
+``filter``, ``aggregation``, ``figures`` e ``render``, ver core/metrics.py),
+lidas dos totais acumulados pelo processo, além de ``total``, a execução
+completa da página.
+
+Os tempos de cada página são a mediana entre artistas e repetições. Com
+``--check``, os totais são comparados aos de ``benchmarks/baseline.json`` e o
+comando termina com erro se alguma página ficar mais lenta que a referência
+além da tolerância (relativa e absoluta). A referência depende da máquina;
+grave-a com ``--update-baseline`` no mesmo ambiente em que a comparação será
+feita.
+
+Uso:
+
+    python -m benchmarks.latency
+    python -m benchmarks.latency --check
+    python -m benchmarks.latency --update-baseline
+"""
+import argparse
+import json
+import statistics
+import sys
+
+from benchmarks import PAGES, ROOT
+from core.metrics import PHASES as METRIC_PHASES
+
+BASELINE_PATH = ROOT / 'benchmarks' / 'baseline.json'
+
+# Artistas medidos: muitos shows, poucos shows e nenhum show, com e sem relacionados
+ARTISTS = ('Marina Sena', 'Lady Gaga', 'Bad Bunny', 'Liniker', 'Tom Zé', 'Tame Impala')
+
+PHASES = (*METRIC_PHASES, 'total')
+
+
+def run_page(page, artist, spotify_id, reruns):
+    """Executa a página para o artista; retorna as fases da primeira execução e das reexecuções."""
+    from streamlit.testing.v1 import AppTest
+
+    from core.metrics import load_registry
+
+    # O app completo: streamlit_app.py inicia e encerra a medição de cada execução
+    at = AppTest.from_file(str(ROOT / 'streamlit_app.py'), default_timeout=120)
+    at.session_state['selected_artist'] = artist
+    at.session_state['selected_artist_id'] = spotify_id
+    at.run()
+    at.switch_page(f'views/{page}.py')
+
+    registry = load_registry()
+    samples = []
+    for _ in range(1 + reruns):
+        before = {phase: registry.seconds[page, phase] for phase in PHASES}
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{page} ({artist}): {at.exception[0].message}")
+        samples.append({phase: registry.seconds[page, phase] - before[phase] for phase in PHASES})
+    return samples[0], samples[1:]
+
+
+def measure(pages, artists, reruns):
+    """Mediana das fases por página, em milissegundos, para a primeira execução e as reexecuções."""
+    from core.catalog import load_catalog
+
+    ids = load_catalog().ids
+
+    results = {}
+    for page in pages:
+        first, rerun = [], []
+        for artist in artists:
+            sample, samples = run_page(page, artist, ids[artist], reruns)
+            first.append(sample)
+            rerun.extend(samples)
+        results[page] = {
+            kind: {phase: round(statistics.median(s[phase] for s in runs) * 1000, 2) for phase in PHASES}
+            for kind, runs in (('first', first), ('rerun', rerun))
+        }
+    return results
+
+
+def compare(results, baseline, tolerance, slack):
+    """
+    Páginas cujo tempo total ficou acima da referência multiplicada por
+    (1 + tolerance) mais ``slack`` milissegundos.
+
+    A folga absoluta evita falsos alarmes em páginas de poucos milissegundos,
+    em que a variação entre execuções supera a folga relativa.
+    """
+    regressions = []
+    for page, kinds in results.items():
+        for kind, phases in kinds.items():
+            reference = baseline.get(page, {}).get(kind, {}).get('total')
+            if reference is not None and phases['total'] > reference * (1 + tolerance) + slack:
+                regressions.append((page, kind, reference, phases['total']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a latência de execução de cada página do Pulse.")
+    parser.add_argument('--pages', nargs='+', choices=PAGES, default=list(PAGES), help="páginas a medir")
+    parser.add_argument('--artists', nargs='+', default=list(ARTISTS), help="artistas medidos")
+    parser.add_argument('--reruns', type=int, default=5, help="reexecuções por artista após a primeira")
+    parser.add_argument('--check', action='store_true', help="compara com a referência e falha se houver regressão")
+    parser.add_argument('--tolerance', type=float, default=0.5, help="folga relativa permitida sobre a referência")
+    parser.add_argument('--slack', type=float, default=5.0, help="folga absoluta permitida sobre a referência, em ms")
+    parser.add_argument('--update-baseline', action='store_true', help="grava os resultados como nova referência")
+    parser.add_argument('--output', help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    results = measure(args.pages, args.artists, args.reruns)
+
+    print(f"{'página':<18}{'execução':<10}" + ''.join(f"{phase:>12}" for phase in PHASES) + "  (ms)")
+    for page, kinds in results.items():
+        for kind, phases in kinds.items():
+            print(f"{page:<18}{kind:<10}" + ''.join(f"{phases[phase]:>12.1f}" for phase in PHASES))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + '\n')
+        print(f"Referência gravada em {BASELINE_PATH}")
+
+    if args.check:
+        if not BASELINE_PATH.exists():
+            sys.exit(f"Referência não encontrada: {BASELINE_PATH} (gere com --update-baseline)")
+        regressions = compare(results, json.loads(BASELINE_PATH.read_text()), args.tolerance, args.slack)
+        for page, kind, reference, total in regressions:
+            print(f"REGRESSÃO {page} ({kind}): {total:.1f} ms, referência {reference:.1f} ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"Sem regressões (tolerância de {args.tolerance:.0%} + {args.slack:g} ms).")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Tempo de inicialização a frio de cada página.
+
+Cada página é executada em um processo Python novo, sem nenhum cache
+aquecido, como acontece após um deploy ou ao escalar o serviço. Para cada
+execução são medidos, a partir do início do processo:
+
+- ``imports``: importação do Streamlit e do executor de testes (``AppTest``);
+- ``first_paint``: primeiro elemento enviado pela página;
+- ``complete``: fim da execução do script da página.
+
+Também é indicado se o ``plotly.express`` já estava importado no primeiro
+elemento (não deveria: as páginas só o importam ao construir um gráfico; o
+pacote base ``plotly`` é importado pelo próprio Streamlit).
+
+Uso:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --pages home shows --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+START = time.perf_counter()
+
+from benchmarks import PAGES, ROOT
+
+
+def measure_page(page):
+    """Executa a página neste processo e retorna os tempos desde o início do processo."""
+    from streamlit.delta_generator import DeltaGenerator
+    from streamlit.testing.v1 import AppTest
+
+    timings = {'imports': time.perf_counter() - START, 'first_paint': None, 'plotly_at_first_paint': None}
+
+    enqueue = DeltaGenerator._enqueue
+
+    def timed_enqueue(self, *args, **kwargs):
+        if timings['first_paint'] is None:
+            timings['first_paint'] = time.perf_counter() - START
+            timings['plotly_at_first_paint'] = 'plotly.express' in sys.modules
+        return enqueue(self, *args, **kwargs)
+
+    DeltaGenerator._enqueue = timed_enqueue
+    at = AppTest.from_file(str(ROOT / 'views' / f'{page}.py'), default_timeout=120)
+    at.run()
+    timings['complete'] = time.perf_counter() - START
+    timings['errors'] = [e.message for e in at.exception]
+    return timings
+
+
+def run_cold(page):
+    """Mede a página em um processo novo."""
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup', '--child', page],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização a frio de cada página do Pulse.")
+    parser.add_argument('--pages', nargs='+', choices=PAGES, default=list(PAGES), help="páginas a medir")
+    parser.add_argument('--repeat', type=int, default=3, help="execuções por página (é reportada a mediana)")
+    parser.add_argument('--child', choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_page(args.child)))
+        return
+
+    print(f"{'página':<18}{'imports':>10}{'1º elemento':>14}{'completo':>11}  plotly.express no 1º elemento")
+    for page in args.pages:
+        runs = [run_cold(page) for _ in range(args.repeat)]
+        for run in runs:
+            for error in run['errors']:
+                print(f"{page}: erro na execução: {error}", file=sys.stderr)
+        median = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ('imports', 'first_paint', 'complete')
+        }
+        plotly = 'sim' if any(run['plotly_at_first_paint'] for run in runs) else 'não'
+        print(
+            f"{page:<18}{median['imports']:>9.2f}s{median['first_paint']:>13.2f}s"
+            f"{median['complete']:>10.2f}s  {plotly}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Gerador de dados sintéticos para testes de escala.
+
+Gera os mesmos arquivos de ``data/`` (artistas, músicas, álbuns, shows
+passados e futuros e artistas relacionados), com o mesmo schema, em uma escala
+configurável. Os dados originais são mantidos e acrescidos de artistas
+sintéticos até atingir ``scale`` vezes o número original de artistas, com
+distribuições parecidas com as de produção:
+
+- gêneros com cauda longa (frequência de Zipf sobre um vocabulário que cresce
+  com a escala);
+- número de shows por artista com distribuição de Pareto: a maioria tem poucos
+  ou nenhum show, e alguns têm milhares;
+- locais, cidades, países e fusos sorteados dos shows reais, para que a
+  geocodificação funcione como nos dados originais;
+- artistas relacionados sorteados com preferência pelos mais populares.
+
+Nada é baixado: tudo é derivado dos arquivos de ``data/`` e de um gerador
+pseudoaleatório com semente fixa.
+
+Uso:
+
+    python -m benchmarks.synthetic --scale 100
+    PULSE_DATA_DIR=data/synthetic/100x streamlit run streamlit_app.py
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.data import DATA_DIR, SCHEMAS
+
+ALPHABET = np.array(list('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'))
+HEX = np.array(list('0123456789abcdef'))
+SYLLABLES = np.array([
+    'ba', 'be', 'ca', 'da', 'do', 'fe', 'ga', 'ja', 'ka', 'la', 'le', 'li', 'lu', 'ma', 'mi', 'mo',
+    'na', 'ne', 'no', 'pa', 'pe', 'ra', 'ri', 'ro', 'sa', 'se', 'ta', 'ti', 'to', 'va', 'vi', 'ze',
+])
+GENRE_STYLES = np.array(['pop', 'rock', 'funk', 'jazz', 'folk', 'trap', 'house', 'soul', 'samba', 'core'])
+
+EVENT_URL = 'https://www.bandsintown.com/e/'
+EVENT_QUERY = '?came_from=251&utm_medium=web&utm_source=artist_page&utm_campaign='
+
+
+def random_ids(rng, n, length=22):
+    """Identificadores base62 no formato do Spotify."""
+    chars = ALPHABET[rng.integers(0, len(ALPHABET), size=(n, length))]
+    return chars.view(f'<U{length}').ravel()
+
+
+def random_uuids(rng, n):
+    """UUIDs (formato do MusicBrainz)."""
+    s = pd.Series(HEX[rng.integers(0, len(HEX), size=(n, 32))].view('<U32').ravel())
+    return (s.str[:8] + '-' + s.str[8:12] + '-' + s.str[12:16] + '-' + s.str[16:20] + '-' + s.str[20:]).to_numpy()
+
+
+def random_words(rng, n, syllables=3):
+    """Palavras inventadas, com a primeira letra maiúscula."""
+    words = SYLLABLES[rng.integers(0, len(SYLLABLES), size=(n, syllables))]
+    joined = words[:, 0]
+    for column in range(1, syllables):
+        joined = np.char.add(joined, words[:, column])
+    return np.char.capitalize(joined)
+
+
+def unique_names(names):
+    """Acrescenta um número aos nomes repetidos (o catálogo exige nomes únicos)."""
+    names = pd.Series(names)
+    repeat = names.groupby(names).cumcount()
+    return names.where(repeat == 0, names + ' ' + (repeat + 1).astype(str)).to_numpy()
+
+
+def zipf_choice(rng, n_options, size, exponent=1.1):
+    """Índices em [0, n_options) com frequência proporcional a 1/posição^exponent."""
+    weights = 1.0 / np.arange(1, n_options + 1) ** exponent
+    return rng.choice(n_options, size=size, p=weights / weights.sum())
+
+
+def slug(values):
+    return pd.Series(values).str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True).str.strip('-')
+
+
+def read_source(source):
+    """Arquivos originais, sem conversão de tipos."""
+    return {
+        name: pd.read_csv(source / schema['file'], dtype=str, keep_default_na=False, na_values=[''])
+        for name, schema in SCHEMAS.items()
+    }
+
+
+def generate_artists(rng, base, n, scale):
+    """Artistas sintéticos, com gêneros de cauda longa."""
+    real_genres = (
+        base['genres'].dropna().str.split(', ').explode().value_counts().index.to_numpy()
+    )
+    n_synthetic = int(len(real_genres) * (np.sqrt(scale) * 4))
+    synthetic_genres = np.char.add(
+        np.char.add(np.char.capitalize(random_words(rng, n_synthetic, 2)), ' '),
+        np.char.capitalize(GENRE_STYLES[rng.integers(0, len(GENRE_STYLES), n_synthetic)])
+    )
+    vocabulary = np.concatenate([real_genres, pd.unique(synthetic_genres)])
+
+    genre_counts = 1 + rng.poisson(1.5, n)
+    genre_codes = zipf_choice(rng, len(vocabulary), genre_counts.sum())
+    owner = np.repeat(np.arange(n), genre_counts)
+    genres = (
+        pd.DataFrame({'owner': owner, 'genre': vocabulary[genre_codes]})
+        .drop_duplicates()
+        .groupby('owner')['genre'].agg(', '.join)
+        .reindex(range(n))
+    )
+
+    spotify_id = random_ids(rng, n)
+    popularity = rng.choice(base['popularity'].astype(int).to_numpy(), n)
+    followers = 10 ** (popularity / 20 + rng.normal(2.0, 0.6, n))
+    profile = base[['artist_type', 'gender', 'country']].sample(n, replace=True, random_state=rng).to_numpy()
+    names = unique_names(np.char.add(np.char.add(random_words(rng, n, 2), ' '), random_words(rng, n, 3)))
+
+    return pd.DataFrame({
+        'artist_name': names,
+        'spotify_id': spotify_id,
+        'musicbrainz_id': random_uuids(rng, n),
+        'popularity': popularity,
+        'followers': followers.astype(np.int64),
+        'genres': genres.to_numpy(),
+        'image_url': rng.choice(base['image_url'].dropna().to_numpy(), n),
+        'spotify_url': np.char.add('https://open.spotify.com/artist/', spotify_id),
+        'artist_type': profile[:, 0],
+        'gender': profile[:, 1],
+        'country': profile[:, 2],
+    })
+
+
+def per_artist_counts(rng, table, n):
+    """Quantidade de linhas por artista, sorteada da distribuição real."""
+    return rng.choice(table.groupby('spotify_id').size().to_numpy(), n)
+
+
+def generate_tracks(rng, base, artists):
+    counts = per_artist_counts(rng, base, len(artists))
+    owner = np.repeat(np.arange(len(artists)), counts)
+    popularity = artists['popularity'].to_numpy()[owner] + rng.normal(-10, 15, len(owner))
+    return pd.DataFrame({
+        'track_id': random_ids(rng, len(owner)),
+        'spotify_id': artists['spotify_id'].to_numpy()[owner],
+        'track_name': random_words(rng, len(owner), 3),
+        'popularity': np.clip(popularity, 0, 100).astype(int),
+    })
+
+
+def generate_albums(rng, base, artists):
+    counts = per_artist_counts(rng, base, len(artists))
+    owner = np.repeat(np.arange(len(artists)), counts)
+    n = len(owner)
+    kind = rng.choice(base['type'].to_numpy(), n)
+    tracks = np.select(
+        [kind == 'single', kind == 'album'],
+        [rng.integers(1, 4, n), rng.integers(8, 17, n)],
+        default=rng.integers(10, 31, n)
+    )
+    return pd.DataFrame({
+        'album_id': random_ids(rng, n),
+        'spotify_id': artists['spotify_id'].to_numpy()[owner],
+        'album_name': random_words(rng, n, 3),
+        'release_date': np.maximum(2025 - rng.geometric(0.12, n) + 1, 1960),
+        'total_tracks': tracks,
+        'type': kind,
+    })
+
+
+def generate_events(rng, past, future, artists, today):
+    """Shows passados e futuros; o número por artista segue uma distribuição de Pareto."""
+    n_artists = len(artists)
+    counts = np.minimum((rng.pareto(1.16, n_artists) + 1) * 4, 5000).astype(int)
+    counts[rng.random(n_artists) < 0.35] = 0
+    owner = np.repeat(np.arange(n_artists), counts)
+    n = len(owner)
+
+    venues = pd.concat([past, future])[['venue_name', 'venue_city', 'venue_country', 'timezone']]
+    venue = venues.sample(n, replace=True, random_state=rng).reset_index(drop=True)
+
+    # 10% dos shows no próximo ano, o restante desde 2013
+    start = pd.Timestamp('2013-01-01')
+    upcoming = rng.random(n) < 0.1
+    days = np.where(
+        upcoming,
+        (today - start).days + rng.integers(0, 365, n),
+        rng.integers(0, (today - start).days, n)
+    )
+    dates = start + pd.to_timedelta(days, unit='D')
+    hours = rng.choice(pd.to_datetime(past['start_time']).dt.hour.to_numpy(), n)
+    start_time = dates + pd.to_timedelta(hours, unit='h')
+
+    event_id = 2_000_000_000 + np.arange(n)
+    artist_name = artists['artist_name'].to_numpy()[owner]
+    url = EVENT_URL + pd.Series(event_id).astype(str) + '-' + slug(artist_name) + '-at-' + slug(venue['venue_name']) + EVENT_QUERY
+    events = pd.DataFrame({
+        'event_id': event_id,
+        'spotify_id': artists['spotify_id'].to_numpy()[owner],
+        'artist_name': artist_name,
+        'event_date': dates.strftime('%Y-%m-%d'),
+        'venue_name': venue['venue_name'],
+        'venue_city': venue['venue_city'],
+        'venue_country': venue['venue_country'],
+        'event_url': url + 'event',
+        'ticket_url': url + 'ticket_rsvp',
+        'ticket_status': np.where(upcoming, np.where(rng.random(n) < 0.96, 'Tickets', 'Set Reminder'), 'I Was There'),
+        'start_time': start_time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'timezone': venue['timezone'],
+    })
+    # O arquivo de shows passados não tem a coluna event_id (ela vem da URL)
+    return events.loc[~upcoming, past.columns], events.loc[upcoming, future.columns]
+
+
+def generate_related(rng, base, artists, candidates):
+    """Relacionados sorteados entre todos os artistas, com preferência pelos mais populares."""
+    counts = per_artist_counts(rng, base, len(artists))
+    owner = np.repeat(np.arange(len(artists)), counts)
+
+    weights = (candidates['popularity'].astype(float).to_numpy() + 1) ** 2
+    related = rng.choice(len(candidates), size=len(owner), p=weights / weights.sum())
+    df = pd.DataFrame({
+        'spotify_id': artists['spotify_id'].to_numpy()[owner],
+        'related_artist_id': candidates['spotify_id'].to_numpy()[related],
+        'related_artist_name': candidates['artist_name'].to_numpy()[related],
+        'related_artist_popularity': candidates['popularity'].to_numpy()[related],
+        'related_artist_genres': candidates['genres'].str.lower().to_numpy()[related],
+    })
+    df = df[df['spotify_id'] != df['related_artist_id']]
+    return df.drop_duplicates(['spotify_id', 'related_artist_id'])
+
+
+def generate(source, scale, seed=0, today=None):
+    """Tabelas originais acrescidas dos dados sintéticos, na escala pedida."""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize() if today is None else pd.Timestamp(today)
+    base = read_source(source)
+
+    n = len(base['artists']) * (scale - 1)
+    artists = generate_artists(rng, base['artists'], n, scale)
+    candidates = pd.concat([base['artists'], artists.astype({'popularity': str})], ignore_index=True)
+    candidates['popularity'] = candidates['popularity'].astype(int)
+    past, future = generate_events(rng, base['past_events'], base['future_events'], artists, today)
+
+    generated = {
+        'artists': artists,
+        'tracks': generate_tracks(rng, base['tracks'], artists),
+        'albums': generate_albums(rng, base['albums'], artists),
+        'past_events': past,
+        'future_events': future,
+        'related_artists': generate_related(rng, base['related_artists'], artists, candidates),
+    }
+    return {
+        name: pd.concat([base[name], generated[name].astype('string')], ignore_index=True)
+        for name in SCHEMAS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos do Pulse em escala.")
+    parser.add_argument('--scale', type=int, default=10, help="múltiplo do número original de artistas (ex.: 10 a 1000)")
+    parser.add_argument('--seed', type=int, default=0, help="semente do gerador pseudoaleatório")
+    parser.add_argument('--source', default=str(DATA_DIR), help="diretório com os dados originais")
+    parser.add_argument('--output', help="diretório de saída (padrão: data/synthetic/<scale>x)")
+    args = parser.parse_args()
+
+    if args.scale < 1:
+        parser.error("--scale deve ser pelo menos 1")
+    output = Path(args.output) if args.output else Path(args.source) / 'synthetic' / f'{args.scale}x'
+
+    start = time.perf_counter()
+    tables = generate(Path(args.source), args.scale, seed=args.seed)
+    output.mkdir(parents=True, exist_ok=True)
+    for name, schema in SCHEMAS.items():
+        tables[name].to_csv(output / schema['file'], index=False)
+        print(f"{schema['file']}: {len(tables[name])} linhas")
+
+    events = pd.concat([tables['past_events'], tables['future_events']])
+    top = events['artist_name'].value_counts().head(3)
+    print("Artistas com mais shows: " + ", ".join(f"{name} ({count})" for name, count in top.items()))
+    print(f"Dados gravados em {output} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
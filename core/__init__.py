@@ -0,0 +1 @@
+"""Camada compartilhada do Pulse: dados, índices e componentes usados pelas páginas."""
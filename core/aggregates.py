@@ -0,0 +1,327 @@
+"""
+Agregados por artista materializados.
+
+Os agregados exibidos pelas páginas de músicas, álbuns, shows e artistas
+relacionados são calculados para todos os artistas de uma vez, com groupby
+vetorizados sobre as tabelas completas, e gravados em ``data/aggregates/``. As páginas apenas
+consultam a fatia do artista selecionado.
+
+Para gerar (ou atualizar) o armazenamento:
+
+    python -m core.aggregates
+
+Se os arquivos não existirem ou forem mais antigos que os CSVs de origem, os
+agregados são recalculados em memória na primeira consulta do processo. Depois
+disso, os agregados de shows acompanham as linhas acrescentadas aos arquivos de
+eventos (ver core/ingest.py): apenas os artistas com shows novos são
+recalculados, a partir da tabela em memória.
+"""
+import argparse
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from core.bands import RELATED_BANDS, TRACK_BANDS
+from core.boxplot import box_stats
+from core.data import DATA_DIR, SCHEMAS, load_table, read_events, read_table
+from core.geo import GAZETTEER_DIR, GAZETTEER_FILES
+from core.database import backend_enabled, load_database
+from core.index import ArtistIndex, replace_artists
+from core.ingest import load_event_store
+from core.metrics import timed
+
+STORE_DIR = DATA_DIR / 'aggregates'
+
+SOURCE_TABLES = ('tracks', 'albums', 'past_events', 'future_events', 'related_artists')
+
+AGGREGATES = (
+    'artist_summary',
+    'track_bands',
+    'track_box',
+    'track_outliers',
+    'album_years',
+    'album_types',
+    'album_decades',
+    'show_countries',
+    'show_cities',
+    'show_timeline',
+    'related_bands',
+    'related_box',
+    'related_outliers',
+)
+
+
+def _counts(df, columns, name='count'):
+    """Contagem por artista e pelas colunas dadas, apenas combinações presentes."""
+    return df.groupby(['spotify_id', *columns], observed=True).size().reset_index(name=name)
+
+
+def _top_counts(df, columns, coords):
+    """
+    Contagem de shows por artista e local, do mais frequente para o menos frequente.
+
+    As colunas ``coords`` são constantes dentro de cada local e acompanham a contagem.
+    """
+    groups = df.groupby(['spotify_id', *columns], observed=True)
+    counts = groups[list(coords)].first().assign(show_count=groups.size()).reset_index()
+    counts[columns] = counts[columns].astype(str)
+    return counts.sort_values(['spotify_id', 'show_count', columns[-1]], ascending=[True, False, True])
+
+
+def build_show_aggregates(events_df):
+    """Agregados de shows e as colunas de shows do resumo (``show_summary``, indexado por artista)."""
+    # Locais agrupados pelo país canônico do gazetteer (ex.: "Brasil" e "Brazil",
+    # ou "TX" e "United States", contam como o mesmo país)
+    show_countries = _top_counts(events_df, ['country'], ['country_lat', 'country_lon']).rename(
+        columns={'country_lat': 'lat', 'country_lon': 'lon'}
+    )
+    show_cities = _top_counts(events_df, ['country', 'venue_city'], ['lat', 'lon', 'geo_precision'])
+    show_summary = pd.DataFrame({
+        'show_count': events_df.groupby('spotify_id', observed=True).size(),
+        'show_countries': show_countries.groupby('spotify_id', observed=True).size(),
+        'show_cities': show_cities.groupby('spotify_id', observed=True).size(),
+    }).fillna({'show_countries': 0, 'show_cities': 0})
+    show_timeline = _counts(
+        events_df.assign(year_month=events_df['event_date'].dt.to_period('M').astype(str)),
+        ['year_month'],
+        name='show_count'
+    )
+
+    return {
+        'show_summary': show_summary,
+        'show_countries': show_countries,
+        'show_cities': show_cities,
+        'show_timeline': show_timeline,
+    }
+
+
+def build_aggregates(tracks_df, albums_df, events_df, related_df):
+    """Calcula todos os agregados por artista em uma única passada por tabela."""
+    tracks_df = tracks_df.assign(band=TRACK_BANDS.classify(tracks_df['popularity']))
+    track_summary = tracks_df.groupby('spotify_id', observed=True)['popularity'].agg(
+        track_count='size',
+        popularity_mean='mean',
+        popularity_max='max'
+    )
+    track_bands = _counts(tracks_df, ['band']).rename(columns={'band': 'category'})
+    track_box, track_outliers = box_stats(tracks_df, 'popularity')
+
+    albums_df = albums_df.assign(
+        release_year=pd.to_numeric(albums_df['release_date'], errors='coerce')
+    )
+    albums_df['decade'] = (albums_df['release_year'] // 10) * 10
+    album_summary = albums_df.groupby('spotify_id', observed=True)['total_tracks'].agg(
+        album_count='size',
+        album_tracks_mean='mean'
+    )
+    album_years = _counts(albums_df, ['release_year'])
+    album_types = _counts(albums_df, ['type']).sort_values(['spotify_id', 'count'], ascending=[True, False])
+    album_decades = _counts(albums_df, ['decade', 'type'])
+
+    shows = build_show_aggregates(events_df)
+    show_summary = shows.pop('show_summary')
+
+    related_bands = _counts(
+        related_df.assign(band=RELATED_BANDS.classify(related_df['related_artist_popularity'])),
+        ['band']
+    ).rename(columns={'band': 'category'})
+    related_box, related_outliers = box_stats(related_df, 'related_artist_popularity')
+
+    artist_summary = (
+        track_summary.join(album_summary, how='outer')
+        .join(show_summary, how='outer')
+        .reset_index()
+    )
+
+    return {
+        'artist_summary': artist_summary,
+        'track_bands': track_bands,
+        'track_box': track_box,
+        'track_outliers': track_outliers,
+        'album_years': album_years,
+        'album_types': album_types,
+        'album_decades': album_decades,
+        **shows,
+        'related_bands': related_bands,
+        'related_box': related_box,
+        'related_outliers': related_outliers,
+    }
+
+
+def compute_aggregates():
+    """Lê as tabelas de origem dos arquivos e calcula os agregados (usado por ``main``)."""
+    tracks_df, albums_df, related_df = (read_table(name) for name in ('tracks', 'albums', 'related_artists'))
+    events_df = read_events()
+    return build_aggregates(tracks_df, albums_df, events_df, related_df)
+
+
+def write_store(aggregates, store_dir=STORE_DIR):
+    """Grava os agregados em ``store_dir``, um CSV por agregado."""
+    store_dir.mkdir(parents=True, exist_ok=True)
+    for name in AGGREGATES:
+        aggregates[name].to_csv(store_dir / f'{name}.csv', index=False)
+
+
+def store_is_fresh(store_dir=STORE_DIR):
+    """O armazenamento existe e é mais recente que todos os CSVs de origem e o gazetteer."""
+    paths = [store_dir / f'{name}.csv' for name in AGGREGATES]
+    if not all(path.exists() for path in paths):
+        return False
+    sources = [DATA_DIR / SCHEMAS[name]['file'] for name in SOURCE_TABLES]
+    sources += [GAZETTEER_DIR / file for file in GAZETTEER_FILES]
+    return min(p.stat().st_mtime for p in paths) >= max(p.stat().st_mtime for p in sources)
+
+
+def read_store(store_dir=STORE_DIR):
+    """Lê os agregados gravados por ``write_store``."""
+    return {
+        name: pd.read_csv(store_dir / f'{name}.csv', dtype={'spotify_id': 'category'})
+        for name in AGGREGATES
+    }
+
+
+class AggregateStore:
+    """Agregados ordenados por artista, com um índice de linhas por tabela."""
+
+    def __init__(self, aggregates, events_generation=0):
+        self._tables = {}
+        self._lock = threading.Lock()
+        # Versão da tabela de eventos refletida nos agregados de shows (ver core/ingest.py)
+        self.events_generation = events_generation
+        for name, df in aggregates.items():
+            self._set(name, df)
+
+    def _set(self, name, df):
+        df = df.astype({'spotify_id': 'category'})
+        df = df.sort_values('spotify_id', kind='stable', ignore_index=True)
+        # Frame e índice substituídos juntos: uma consulta concorrente nunca
+        # usa os intervalos de uma versão sobre o frame de outra
+        self._tables[name] = (df, ArtistIndex(df['spotify_id']))
+
+    def sync_events(self, snapshot):
+        """
+        Atualiza os agregados de shows se a tabela de eventos recebeu linhas novas.
+
+        Apenas os artistas alterados desde a versão refletida (ver
+        ``EventSnapshot.changed_since`` em core/ingest.py) são recalculados, a
+        partir das suas fatias da tabela, e suas linhas substituem as antigas
+        sem reordenar os agregados (ver ``replace_artists`` em core/index.py).
+        Depois de uma recarga completa da tabela, ou se as versões intermediárias
+        não estiverem mais registradas, todos os agregados de shows são refeitos.
+        """
+        if snapshot.generation == self.events_generation:
+            return
+        with self._lock:
+            if snapshot.generation == self.events_generation:
+                return
+            artists = snapshot.changed_since(self.events_generation)
+            if artists is None:
+                self._rebuild_shows(snapshot.events)
+            elif artists:
+                self._update_shows(snapshot, artists)
+            self.events_generation = snapshot.generation
+
+    def _rebuild_shows(self, events_df):
+        shows = build_show_aggregates(events_df)
+        summary = (
+            self._tables['artist_summary'][0]
+            .drop(columns=list(shows['show_summary'].columns))
+            .astype({'spotify_id': str})
+            .set_index('spotify_id')
+            .join(shows.pop('show_summary'), how='outer')
+            .reset_index()
+        )
+        for name, df in {'artist_summary': summary, **shows}.items():
+            self._set(name, df)
+
+    def _update_shows(self, snapshot, artists):
+        events_df = pd.concat([snapshot.events.iloc[slice(*snapshot.index.bounds(artist))] for artist in artists])
+        shows = build_show_aggregates(events_df)
+        show_summary = shows.pop('show_summary').rename(index=str)
+        summary = (
+            pd.concat([self.rows('artist_summary', artist) for artist in artists])
+            .drop(columns=list(show_summary.columns))
+            .astype({'spotify_id': str})
+            .set_index('spotify_id')
+            .join(show_summary, how='outer')
+            .reset_index()
+        )
+        for name, rows in {'artist_summary': summary, **shows}.items():
+            df, index = self._tables[name]
+            df = replace_artists(df, index, artists, rows)
+            self._tables[name] = (df, ArtistIndex(df['spotify_id']))
+
+    def frame(self, name):
+        """Agregado ``name`` completo, de todos os artistas."""
+        return self._tables[name][0]
+
+    def rows(self, name, spotify_id):
+        """Linhas do agregado ``name`` para o artista, sem cópia."""
+        df, index = self._tables[name]
+        start, stop = index.bounds(spotify_id)
+        return df.iloc[start:stop]
+
+    def summary(self, spotify_id):
+        """Resumo numérico do artista, ou None se ele não aparecer em nenhuma tabela."""
+        rows = self.rows('artist_summary', spotify_id)
+        return rows.iloc[0] if not rows.empty else None
+
+
+@st.cache_resource(show_spinner=False)
+def load_aggregates():
+    """Armazenamento compartilhado pelo processo; recalcula se estiver ausente ou desatualizado."""
+    if store_is_fresh():
+        return AggregateStore(read_store())
+    # Mesmas tabelas usadas pelas páginas: cada CSV é lido uma única vez pelo
+    # processo, e os agregados de shows partem da mesma versão da tabela de
+    # eventos que o EventStore publica
+    tracks_df, albums_df, related_df = (load_table(name) for name in ('tracks', 'albums', 'related_artists'))
+    snapshot = load_event_store().snapshot()
+    aggregates = build_aggregates(tracks_df, albums_df, snapshot.events, related_df)
+    return AggregateStore(aggregates, snapshot.generation)
+
+
+def current_aggregates():
+    """Armazenamento com os agregados de shows em dia com a tabela de eventos."""
+    store = load_aggregates()
+    store.sync_events(load_event_store().snapshot())
+    return store
+
+
+@timed('aggregation')
+def artist_aggregate(name, spotify_id, limit=None):
+    """Fatia do agregado ``name`` para o artista selecionado; ``limit`` mantém apenas as primeiras linhas."""
+    if backend_enabled():
+        return load_database().aggregate(name, spotify_id, limit)
+    rows = current_aggregates().rows(name, spotify_id)
+    return rows if limit is None else rows.head(limit)
+
+
+@timed('aggregation')
+def artist_summary(spotify_id):
+    """Resumo numérico (contagens e médias) do artista selecionado."""
+    if backend_enabled():
+        return load_database().summary(spotify_id)
+    return current_aggregates().summary(spotify_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os agregados por artista do Pulse.")
+    parser.add_argument('--output', default=str(STORE_DIR), help="diretório de saída")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    aggregates = compute_aggregates()
+    write_store(aggregates, store_dir=Path(args.output))
+    elapsed = time.perf_counter() - start
+
+    for name in AGGREGATES:
+        print(f"{name}: {len(aggregates[name])} linhas")
+    print(f"Agregados gravados em {args.output} ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
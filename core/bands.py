@@ -0,0 +1,56 @@
+"""
+Faixas de popularidade.
+
+Classifica colunas inteiras de popularidade em faixas com uma única busca
+binária vetorizada (``np.searchsorted``), retornando um categórico ordenado
+com a mesma ordem de faixas em todas as páginas.
+"""
+import numpy as np
+import pandas as pd
+
+
+class PopularityBands:
+    """Faixas definidas pelo limite inferior de cada uma e seus rótulos."""
+
+    def __init__(self, edges, labels):
+        if len(edges) != len(labels):
+            raise ValueError("Cada faixa precisa de exatamente um limite inferior e um rótulo.")
+        if list(edges) != sorted(edges):
+            raise ValueError("Os limites das faixas devem estar em ordem crescente.")
+        self.edges = np.asarray(edges, dtype=float)
+        self.labels = list(labels)
+        self.dtype = pd.CategoricalDtype(self.labels, ordered=True)
+
+    def codes(self, values):
+        """Índice da faixa de cada valor; -1 para valores ausentes ou abaixo da primeira faixa."""
+        values = np.asarray(values, dtype=float)
+        codes = np.searchsorted(self.edges, values, side='right') - 1
+        codes[np.isnan(values)] = -1
+        return codes
+
+    def sql(self, column):
+        """Expressão SQL equivalente a ``codes`` para a coluna ``column`` (ver core/database.py)."""
+        cases = ' '.join(
+            f'WHEN {column} >= {edge:g} THEN {code}' for code, edge in reversed(list(enumerate(self.edges)))
+        )
+        return f'CASE {cases} ELSE -1 END'
+
+    def classify(self, values):
+        """Faixa de cada valor como categórico ordenado, alinhado ao índice de ``values``."""
+        categorical = pd.Categorical.from_codes(self.codes(values), dtype=self.dtype)
+        if isinstance(values, pd.Series):
+            return pd.Series(categorical, index=values.index, name=values.name)
+        return categorical
+
+
+# Faixas da página de músicas
+TRACK_BANDS = PopularityBands(
+    [0, 30, 50, 70],
+    ["Baixa (0-29)", "Moderado (30-49)", "Popular (50-69)", "Muito Popular (70+)"]
+)
+
+# Faixas da página de artistas relacionados
+RELATED_BANDS = PopularityBands(
+    [0, 20, 40, 60],
+    ["Emergente (0-19)", "Moderado (20-39)", "Popular (40-59)", "Muito Popular (60+)"]
+)
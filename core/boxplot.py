@@ -0,0 +1,85 @@
+"""
+Box plots a partir de estatísticas pré-calculadas.
+
+``px.box`` envia todas as linhas ao navegador, que calcula os quartis em
+JavaScript. Aqui as estatísticas de cada artista (quartis, limites dos bigodes
+e valores atípicos) são calculadas de uma vez para todos os artistas, com
+groupby vetorizados, e guardadas com os agregados (ver core/aggregates.py); a
+figura recebe apenas esses números, e seu tamanho não depende do número de
+linhas.
+
+As regras são as do Plotly: quartis por interpolação linear, bigodes até o
+valor mais extremo dentro de 1,5 vez o intervalo interquartil e, além deles,
+valores atípicos, dos quais são mantidos no máximo OUTLIER_LIMIT por artista
+(os mais distantes da mediana).
+"""
+
+OUTLIER_LIMIT = 50
+
+
+def box_stats(df, column):
+    """
+    Estatísticas do box plot de ``column`` por artista.
+
+    Retorna ``(box, outliers)``: ``box`` tem uma linha por artista, com
+    ``lowerfence``, ``q1``, ``median``, ``q3``, ``upperfence`` e ``count``;
+    ``outliers`` tem uma linha por valor atípico mantido, com ``value``.
+    """
+    values = df[['spotify_id', column]].dropna().rename(columns={column: 'value'})
+    groups = values.groupby('spotify_id', observed=True)['value']
+    box = groups.quantile([0.25, 0.5, 0.75]).unstack()
+    box.columns = ['q1', 'median', 'q3']
+    box['count'] = groups.size()
+
+    # Limites de Tukey de cada artista, alinhados às linhas
+    iqr = box['q3'] - box['q1']
+    low = values['spotify_id'].map(box['q1'] - 1.5 * iqr).astype(float)
+    high = values['spotify_id'].map(box['q3'] + 1.5 * iqr).astype(float)
+    inside = values['value'].between(low, high)
+
+    within = values.loc[inside].groupby('spotify_id', observed=True)['value']
+    box['lowerfence'] = within.min()
+    box['upperfence'] = within.max()
+    box = box[['lowerfence', 'q1', 'median', 'q3', 'upperfence', 'count']].reset_index()
+
+    outliers = values.loc[~inside]
+    distance = (outliers['value'] - outliers['spotify_id'].map(box.set_index('spotify_id')['median']).astype(float)).abs()
+    outliers = outliers.assign(distance=distance).sort_values(
+        ['spotify_id', 'distance'], ascending=[True, False], kind='stable'
+    )
+    outliers = outliers.loc[outliers.groupby('spotify_id', observed=True).cumcount() < OUTLIER_LIMIT]
+    return box, outliers[['spotify_id', 'value']].reset_index(drop=True)
+
+
+def box_figure(box, outliers, label, color, **kwargs):
+    """
+    Box plot de um artista a partir de uma linha de ``box`` e de seus ``outliers``.
+
+    ``kwargs`` são repassados ao layout da figura (ex.: ``title``, ``height``,
+    ``width``).
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    if box is not None:
+        fig.add_trace(go.Box(
+            x=[' '],
+            lowerfence=[box['lowerfence']],
+            q1=[box['q1']],
+            median=[box['median']],
+            q3=[box['q3']],
+            upperfence=[box['upperfence']],
+            name='',
+            marker_color=color,
+        ))
+        if not outliers.empty:
+            fig.add_trace(go.Scatter(
+                x=[' '] * len(outliers),
+                y=outliers['value'],
+                mode='markers',
+                name='',
+                marker_color=color,
+                hovertemplate=f'{label}=%{{y}}<extra></extra>',
+            ))
+    fig.update_layout(yaxis_title=label, showlegend=False, **kwargs)
+    return fig
@@ -0,0 +1,126 @@
+"""
+Catálogo de artistas usado pelo seletor da barra lateral.
+
+Construído uma única vez por processo a partir de ``artists.csv``: nomes
+ordenados, posição de cada nome, spotify_id e linha da tabela de artistas,
+além de um índice de chaves normalizadas (sem acentos e sem diferença entre
+maiúsculas e minúsculas) para a busca por prefixo.
+"""
+import difflib
+import unicodedata
+from bisect import bisect_left
+
+import streamlit as st
+
+from core.data import load_table
+from core.metrics import timed
+
+
+def normalize(text):
+    """Chave de busca: remove acentos e diferenças de caixa."""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold().strip()
+
+
+class ArtistCatalog:
+    """Estrutura de consulta do seletor de artistas."""
+
+    def __init__(self, artists_df):
+        names = artists_df['artist_name'].tolist()
+        spotify_ids = artists_df['spotify_id'].astype(str).tolist()
+
+        # Em nomes repetidos vale a primeira linha, como no filtro antigo com .iloc[0]
+        rows = {}
+        for row, name in enumerate(names):
+            rows.setdefault(name, row)
+
+        self.names = sorted(rows)
+        self.positions = {name: pos for pos, name in enumerate(self.names)}
+        self.rows = rows
+        self.ids = {name: spotify_ids[row] for name, row in rows.items()}
+        self.names_by_id = {spotify_id: name for name, spotify_id in self.ids.items()}
+
+        # Chaves normalizadas do nome completo e de cada palavra do nome,
+        # ordenadas para busca por prefixo com bisect
+        self._keys = sorted((normalize(name), pos) for pos, name in enumerate(self.names))
+        self._tokens = sorted(
+            (token, pos)
+            for pos, name in enumerate(self.names)
+            for token in set(normalize(name).split())
+        )
+        self._lookup = {}
+        for key, pos in self._keys:
+            self._lookup.setdefault(key, pos)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    @property
+    def default(self):
+        """Primeiro artista em ordem alfabética."""
+        return self.names[0] if self.names else None
+
+    def lookup(self, text):
+        """Resolve um nome digitado (sem acentos ou caixa) para o nome do catálogo."""
+        pos = self._lookup.get(normalize(text))
+        return self.names[pos] if pos is not None else None
+
+    def search(self, query, limit=50):
+        """
+        Busca artistas pelo nome.
+
+        Ordem dos resultados: nomes que começam com a busca, nomes com alguma
+        palavra que começa com a busca e, se nada for encontrado, nomes com
+        palavras parecidas (busca aproximada). Sem busca, retorna os primeiros
+        ``limit`` nomes em ordem alfabética.
+        """
+        key = normalize(query)
+        if not key:
+            return self.names[:limit]
+
+        found = []
+        seen = set()
+
+        def collect(entries, prefix):
+            start = bisect_left(entries, (prefix, -1))
+            for entry_key, pos in entries[start:]:
+                if not entry_key.startswith(prefix) or len(found) >= limit:
+                    break
+                if pos not in seen:
+                    seen.add(pos)
+                    found.append(pos)
+
+        collect(self._keys, key)
+        for term in key.split():
+            collect(self._tokens, term)
+
+        if not found:
+            # Busca aproximada restrita às palavras com a mesma inicial
+            first = key[0]
+            start = bisect_left(self._tokens, (first, -1))
+            stop = bisect_left(self._tokens, (chr(ord(first) + 1), -1))
+            candidates = {}
+            for token, pos in self._tokens[start:stop]:
+                candidates.setdefault(token, []).append(pos)
+            for token in difflib.get_close_matches(key, list(candidates), n=limit, cutoff=0.7):
+                for pos in candidates[token]:
+                    if pos not in seen and len(found) < limit:
+                        seen.add(pos)
+                        found.append(pos)
+
+        return [self.names[pos] for pos in found]
+
+
+@st.cache_resource(show_spinner=False)
+def load_catalog():
+    """Catálogo compartilhado pelo processo."""
+    return ArtistCatalog(load_table('artists'))
+
+
+@timed('filter')
+def artist_record(name):
+    """Linha da tabela de artistas correspondente ao nome selecionado."""
+    return load_table('artists').iloc[load_catalog().rows[name]]
@@ -0,0 +1,343 @@
+"""
+Camada de dados compartilhada do Pulse.
+
+Cada tabela de ``data/`` é lida uma única vez por processo, com um schema de
+tipos explícito, e o mesmo DataFrame é entregue a todas as páginas. Como o
+objeto é compartilhado entre sessões, as páginas devem tratá-lo como somente
+leitura; o Copy-on-Write do pandas garante que qualquer alteração feita em uma
+fatia gere uma cópia local em vez de modificar o frame compartilhado.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from core.geo import GAZETTEER_DIR, GAZETTEER_FILES, load_gazetteer
+from core.metrics import count, timed
+
+# Diretório dos CSVs; PULSE_DATA_DIR permite apontar para outro conjunto de
+# dados com o mesmo schema (ex.: os gerados por benchmarks/synthetic.py)
+DATA_DIR = Path(os.environ.get('PULSE_DATA_DIR', Path(__file__).resolve().parent.parent / 'data'))
+
+# Tabelas com várias linhas por artista; ficam ordenadas por spotify_id para
+# que as linhas de cada artista sejam contíguas (ver core/index.py)
+ARTIST_TABLES = ('tracks', 'albums', 'events', 'related_artists')
+
+# Arquivos de eventos, geocodificados na leitura (ver core/geo.py) e unidos na
+# tabela ``events``
+EVENT_TABLES = ('past_events', 'future_events')
+
+# Identificador do evento na URL do Bandsintown (".../e/<id>-..." ou ".../z/<id>-...")
+_EVENT_URL_ID = r'/[ez]/(\d+)-'
+
+# URLs guardadas como modelo categórico + slug (ver compact_urls)
+EVENT_URL_COLUMNS = ('event_url', 'ticket_url')
+
+# Colunas que identificam um evento sem event_id (ver identify_events)
+_EVENT_KEY_COLUMNS = ('spotify_id', 'event_date', 'start_time', 'venue_name', 'venue_city', 'venue_country')
+
+# Copy-on-Write já é o padrão a partir do pandas 3.0
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+_EVENT_DTYPES = {
+    'event_id': 'Int64',
+    'spotify_id': 'category',
+    'artist_name': 'category',
+    'venue_name': 'category',
+    'venue_city': 'category',
+    'venue_country': 'category',
+    'ticket_status': 'category',
+    'timezone': 'category',
+}
+
+_EVENT_DATES = {
+    'event_date': '%Y-%m-%d',
+    'start_time': '%Y-%m-%dT%H:%M:%S',
+}
+
+# Schema de cada tabela: tipos das colunas e colunas de data com seu formato.
+# Colunas de texto livre (nomes, URLs, gêneros) mantêm o tipo padrão do pandas.
+SCHEMAS = {
+    'artists': {
+        'file': 'artists.csv',
+        'dtype': {
+            'spotify_id': 'category',
+            'popularity': 'int8',
+            'followers': 'int64',
+            'artist_type': 'category',
+            'gender': 'category',
+            'country': 'category',
+        },
+        'dates': {},
+    },
+    'tracks': {
+        'file': 'tracks.csv',
+        'dtype': {
+            'spotify_id': 'category',
+            'popularity': 'int8',
+        },
+        'dates': {},
+    },
+    'albums': {
+        'file': 'albums.csv',
+        'dtype': {
+            'spotify_id': 'category',
+            'release_date': 'int16',
+            'total_tracks': 'int16',
+            'type': 'category',
+        },
+        'dates': {},
+    },
+    'past_events': {
+        'file': 'past_events.csv',
+        'dtype': _EVENT_DTYPES,
+        'dates': _EVENT_DATES,
+        # O nome do artista já está no catálogo; nenhuma página o lê dos eventos
+        'skip': ('artist_name',),
+    },
+    'future_events': {
+        'file': 'future_events.csv',
+        'dtype': _EVENT_DTYPES,
+        'dates': _EVENT_DATES,
+        # O nome do artista já está no catálogo; nenhuma página o lê dos eventos
+        'skip': ('artist_name',),
+    },
+    'related_artists': {
+        'file': 'related_artists.csv',
+        'dtype': {
+            'spotify_id': 'category',
+            'related_artist_popularity': 'int8',
+        },
+        'dates': {},
+    },
+}
+
+
+def localize_times(local, timezones):
+    """
+    Converte horários locais (sem fuso) para UTC usando o fuso IANA de cada linha.
+
+    A conversão é feita uma vez por fuso distinto, sobre todas as linhas dele.
+    Linhas sem fuso, ou com horário inexistente/ambíguo na troca de horário de
+    verão, ficam como NaT.
+    """
+    utc = pd.Series(pd.NaT, index=local.index, dtype=f'datetime64[{local.dt.unit}, UTC]')
+    for tz, positions in local.groupby(timezones, observed=True).indices.items():
+        utc.iloc[positions] = (
+            local.iloc[positions]
+            .dt.tz_localize(tz, ambiguous='NaT', nonexistent='NaT')
+            .dt.tz_convert('UTC')
+        )
+    return utc
+
+
+def parse_table(name, source, columns, header=True):
+    """
+    Converte um CSV da tabela ``name`` aplicando o schema declarado em SCHEMAS.
+
+    ``source`` é um caminho ou um buffer com as colunas ``columns``; com
+    ``header=False`` o buffer não tem a linha de cabeçalho (ex.: linhas
+    acrescentadas ao fim de um arquivo já lido, ver core/ingest.py).
+    """
+    schema = SCHEMAS[name]
+    dtype = {col: kind for col, kind in schema['dtype'].items() if col in columns}
+    usecols = [col for col in columns if col not in schema.get('skip', ())]
+    df = pd.read_csv(source, dtype=dtype, names=list(columns), usecols=usecols, header=0 if header else None)
+
+    for col, fmt in schema['dates'].items():
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=fmt, errors='coerce')
+
+    if name in EVENT_TABLES:
+        # start_time é o horário local do show; start_time_utc, o mesmo instante em UTC
+        df['start_time_utc'] = localize_times(df['start_time'], df['timezone'])
+        # País canônico e coordenadas do local de cada show
+        df = load_gazetteer().geocode(df)
+
+    if name == 'related_artists':
+        # Padroniza os nomes dos artistas relacionados
+        df['related_artist_name'] = df['related_artist_name'].str.title()
+
+    return df
+
+
+def read_table(name, path=None):
+    """Lê uma tabela do disco aplicando o schema declarado em SCHEMAS."""
+    path = Path(path) if path is not None else DATA_DIR / SCHEMAS[name]['file']
+    return parse_table(name, path, pd.read_csv(path, nrows=0).columns)
+
+
+def identify_events(events):
+    """
+    Acrescenta a cada evento seu ``event_id`` e uma chave estável, ``event_key``.
+
+    O ``event_id`` vem da coluna de mesmo nome quando existir e, caso contrário,
+    do identificador presente na URL do evento. A chave é o ``event_id`` quando
+    conhecido e, nos demais casos, um hash do conteúdo do evento (artista, data,
+    horário e local): não depende da ordem das linhas nem do processo, então a
+    mesma linha lida em momentos diferentes recebe a mesma chave.
+    """
+    # Um lote só com URLs vazias é lido como float
+    url_ids = events['event_url'].astype('string').str.extract(_EVENT_URL_ID, expand=False)
+    url_ids = pd.to_numeric(url_ids, errors='coerce')
+    event_id = events['event_id'] if 'event_id' in events.columns else pd.Series(pd.NA, index=events.index)
+    event_id = event_id.astype('Int64').fillna(url_ids.astype('Int64'))
+    content = pd.util.hash_pandas_object(events[list(_EVENT_KEY_COLUMNS)], index=False)
+    event_key = event_id.astype('UInt64').fillna(content.astype('UInt64')).astype('uint64')
+    return events.assign(event_id=event_id, event_key=event_key)
+
+
+def _split_urls(urls, event_ids):
+    """
+    Separa as URLs de uma coluna em slug e modelo (ver ``compact_urls``).
+
+    O trecho "<id>-<slug>" começa após o primeiro "/e/" ou "/z/" e termina no
+    primeiro "?" ou "#". As posições vêm de buscas vetorizadas e os cortes são
+    feitos por grupo de linhas com o mesmo início, tamanho de id e tamanho de
+    query string, que são poucos (mesmo domínio e mesmos parâmetros de
+    rastreamento). URLs sem o ``event_id`` do evento nessa posição ficam sem
+    slug e sem modelo.
+    """
+    urls = urls.astype('string')
+    length = urls.str.len()
+    starts = [urls.str.find(marker) for marker in ('/e/', '/z/')]
+    start = starts[0].where((starts[1] < 0) | starts[0].between(0, starts[1]), starts[1]) + 3
+    ends = [urls.str.find(marker) for marker in ('?', '#')]
+    end = pd.concat([found.where(found >= 0, length) for found in ends], axis=1).min(axis=1)
+    positions = pd.DataFrame({'start': start, 'slug': start + event_ids.str.len() + 1, 'tail': length - end})
+    candidates = positions[((start >= 3) & (positions['slug'] <= end)).fillna(False)]
+
+    slugs, templates = [], []
+    for (first, slug_start, tail), rows in candidates.groupby(list(positions)).groups.items():
+        url, stop = urls.loc[rows], -tail if tail else None
+        same_id = url.str.slice(first, slug_start) == event_ids.loc[rows] + '-'
+        slugs.append(url.str.slice(slug_start, stop)[same_id])
+        templates.append(url.str.slice_replace(first, stop, '{id}-{slug}')[same_id])
+    missing = pd.Series(pd.NA, index=urls.index, dtype='string')
+    if not slugs:
+        return missing, missing
+    return pd.concat(slugs).reindex(urls.index), pd.concat(templates).reindex(urls.index)
+
+
+def compact_urls(events):
+    """
+    Guarda as URLs dos eventos de forma compacta.
+
+    Cada coluna de EVENT_URL_COLUMNS vira ``<coluna>_template``, um categórico
+    com o modelo da URL (ex.: ``https://www.bandsintown.com/e/{id}-{slug}?...``,
+    com poucos valores distintos), e o trecho variável comum às duas URLs fica
+    em ``url_slug`` (artista e local, também repetido entre shows). A URL
+    completa é remontada com o ``event_id`` por ``event_url`` em
+    core/events.py. URLs fora desse formato são mantidas inteiras como modelo.
+
+    A separação é vetorizada (ver ``_split_urls``): ``str.extract`` com grupos
+    nomeados, uma vez por coluna, custava mais que a própria leitura do CSV.
+    """
+    event_ids = events['event_id'].astype('string')
+    parts = {col: _split_urls(events[col], event_ids) for col in EVENT_URL_COLUMNS}
+    slug = parts['event_url'][0].fillna(parts['ticket_url'][0])
+
+    templates = {}
+    for col, (col_slug, template) in parts.items():
+        same_slug = (col_slug == slug).fillna(False)
+        templates[f'{col}_template'] = template.where(same_slug, events[col].astype('string'))
+
+    compact = events.drop(columns=list(EVENT_URL_COLUMNS)).assign(url_slug=slug, **templates)
+    return compact.astype({col: 'category' for col in ('url_slug', *templates)})
+
+
+def prepare_events(events):
+    """Identifica os eventos de um lote lido do disco e compacta suas URLs."""
+    return compact_urls(identify_events(events))
+
+
+def combine_events(frames):
+    """
+    Une lotes de eventos (ver ``prepare_events``) em uma única tabela.
+
+    Eventos com a mesma chave são mantidos uma única vez, com os dados do último
+    lote em que aparecem. A tabela é ordenada por (spotify_id, event_date), com
+    datas ausentes no início de cada artista, para permitir busca binária pela
+    data.
+    """
+    categorical = [col for col, dtype in frames[0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    events = pd.concat(frames, ignore_index=True)
+    events = events.loc[~events['event_key'].duplicated(keep='last')]
+
+    # A concatenação de categorias diferentes gera colunas object
+    events = events.astype({col: 'category' for col in categorical})
+    return events.sort_values(
+        ['spotify_id', 'event_date'], kind='stable', na_position='first', ignore_index=True
+    )
+
+
+def read_events():
+    """
+    Une os shows passados e futuros em uma única tabela de eventos.
+
+    A divisão entre passado e futuro dos arquivos vale apenas para o dia em que
+    foram gerados; aqui ela é descartada e recalculada na consulta, a partir da
+    data atual (ver core/events.py). Um evento que apareça nos dois arquivos é
+    mantido uma única vez, com os dados do arquivo de shows futuros (o mais
+    recente).
+    """
+    return combine_events([prepare_events(read_table(name)) for name in EVENT_TABLES])
+
+
+def load_table(name):
+    """
+    Retorna a tabela compartilhada pelo processo.
+
+    As tabelas são lidas apenas na primeira chamada; a de eventos é mantida por
+    core/ingest.py, que incorpora as linhas acrescentadas aos arquivos sem
+    relê-los.
+    """
+    if name == 'events':
+        # Importado aqui porque core.ingest depende deste módulo
+        from core.ingest import load_event_store
+        return load_event_store().refresh()
+    return _load_table(name)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_table(name):
+    count('table_cache_miss')
+    df = read_table(name)
+    if name in ARTIST_TABLES:
+        # Ordenação estável: mantém a ordem original do arquivo dentro de cada artista
+        df = df.sort_values('spotify_id', kind='stable', ignore_index=True)
+    return df
+
+
+def data_version():
+    """
+    Identificador da versão atual dos arquivos de dados.
+
+    Muda sempre que algum CSV de ``data/`` ou do gazetteer é alterado (data de
+    modificação ou tamanho), e serve de chave para caches derivados dos dados.
+    """
+    paths = [DATA_DIR / schema['file'] for schema in SCHEMAS.values()]
+    paths += [GAZETTEER_DIR / file for file in GAZETTEER_FILES]
+    stats = []
+    for path in paths:
+        if path.exists():
+            stat = path.stat()
+            stats.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return hash(tuple(stats))
+
+
+@timed('load')
+def load_data(*names):
+    """
+    Carrega as tabelas pedidas por uma página.
+
+    Em caso de erro, exibe a mensagem e retorna None para cada tabela, mantendo
+    o mesmo contrato dos antigos ``load_data()`` de cada página.
+    """
+    try:
+        return tuple(load_table(name) for name in names)
+    except Exception as e:
+        st.error(f"Erro ao carregar os dados: {str(e)}")
+        return (None,) * len(names)
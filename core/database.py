@@ -0,0 +1,308 @@
+"""
+Backend opcional em SQLite para as consultas por artista.
+
+Por padrão, as tabelas ficam inteiras na memória de cada processo (ver
+core/data.py). Com ``PULSE_BACKEND=sqlite``, as tabelas com várias linhas por
+artista são gravadas em um banco SQLite local, com índices por artista, data e
+país, e as consultas das páginas passam a ser feitas no banco:
+
+- ``artist_rows`` e ``split_events`` buscam apenas as linhas do artista;
+- ``artist_aggregate`` e ``artist_summary`` calculam contagens, agrupamentos e
+  os N primeiros (ex.: países e cidades com mais shows, lançamentos por ano) em
+  SQL, de modo que o processo recebe apenas o resultado.
+
+O catálogo de artistas, o grafo de relacionados e a similaridade por gêneros
+continuam em memória, pois dependem das tabelas inteiras.
+
+Para gerar (ou atualizar) o banco:
+
+    python -m core.database
+
+Se o banco não existir ou for mais antigo que os CSVs de origem, ele é gerado
+na primeira consulta do processo. Linhas acrescentadas depois disso aos
+arquivos de eventos só aparecem após gerar o banco novamente.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from core.bands import RELATED_BANDS, TRACK_BANDS
+from core.boxplot import box_stats
+from core.data import DATA_DIR, SCHEMAS, read_events, read_table
+from core.geo import GAZETTEER_DIR, GAZETTEER_FILES
+
+DATABASE_PATH = Path(os.environ.get('PULSE_DATABASE', DATA_DIR / 'pulse.sqlite'))
+
+SOURCE_TABLES = ('artists', 'tracks', 'albums', 'past_events', 'future_events', 'related_artists')
+
+# Tabelas do banco; a de eventos une os shows passados e futuros (ver read_events)
+TABLES = ('artists', 'tracks', 'albums', 'events', 'related_artists')
+
+INDEXES = (
+    'CREATE UNIQUE INDEX artists_id ON artists (spotify_id)',
+    'CREATE INDEX tracks_artist ON tracks (spotify_id)',
+    'CREATE INDEX albums_artist ON albums (spotify_id, release_date)',
+    'CREATE INDEX events_artist_date ON events (spotify_id, event_date)',
+    'CREATE INDEX events_artist_country ON events (spotify_id, country)',
+    'CREATE INDEX related_artist ON related_artists (spotify_id)',
+    'CREATE INDEX related_target ON related_artists (related_artist_id)',
+)
+
+# Datas gravadas como texto ISO, que ordena cronologicamente
+_DATE_FORMATS = {
+    **SCHEMAS['past_events']['dates'],
+    'start_time_utc': '%Y-%m-%dT%H:%M:%S',
+}
+
+# Tipos numéricos restaurados na leitura das linhas de cada tabela; as colunas
+# categóricas ficam como texto, já que a conversão custa mais que a economia
+# em fatias de um único artista
+_DTYPES = {
+    name: {col: kind for col, kind in SCHEMAS[schema]['dtype'].items() if kind != 'category'}
+    for name, schema in zip(TABLES, ('artists', 'tracks', 'albums', 'past_events', 'related_artists'))
+}
+
+# Agregados por artista calculados no banco, com as mesmas colunas e a mesma
+# ordem dos de core/aggregates.py
+AGGREGATE_QUERIES = {
+    'track_bands': f"""
+        SELECT spotify_id, {TRACK_BANDS.sql('popularity')} AS category, COUNT(*) AS count
+        FROM tracks WHERE spotify_id = :spotify_id
+        GROUP BY category HAVING category >= 0 ORDER BY category
+    """,
+    'album_years': """
+        SELECT spotify_id, release_date AS release_year, COUNT(*) AS count
+        FROM albums WHERE spotify_id = :spotify_id AND release_date IS NOT NULL
+        GROUP BY release_date ORDER BY release_date
+    """,
+    'album_types': """
+        SELECT spotify_id, type, COUNT(*) AS count
+        FROM albums WHERE spotify_id = :spotify_id AND type IS NOT NULL
+        GROUP BY type ORDER BY count DESC, type
+    """,
+    'album_decades': """
+        SELECT spotify_id, (release_date / 10) * 10 AS decade, type, COUNT(*) AS count
+        FROM albums WHERE spotify_id = :spotify_id AND type IS NOT NULL AND release_date IS NOT NULL
+        GROUP BY decade, type ORDER BY decade, type
+    """,
+    'show_countries': """
+        SELECT spotify_id, country, MAX(country_lat) AS lat, MAX(country_lon) AS lon, COUNT(*) AS show_count
+        FROM events WHERE spotify_id = :spotify_id AND country IS NOT NULL
+        GROUP BY country ORDER BY show_count DESC, country
+    """,
+    'show_cities': """
+        SELECT spotify_id, country, venue_city, MAX(lat) AS lat, MAX(lon) AS lon,
+               MAX(geo_precision) AS geo_precision, COUNT(*) AS show_count
+        FROM events WHERE spotify_id = :spotify_id AND country IS NOT NULL AND venue_city IS NOT NULL
+        GROUP BY country, venue_city ORDER BY show_count DESC, venue_city, country
+    """,
+    'show_timeline': """
+        SELECT spotify_id, substr(event_date, 1, 7) AS year_month, COUNT(*) AS show_count
+        FROM events WHERE spotify_id = :spotify_id AND event_date IS NOT NULL
+        GROUP BY year_month ORDER BY year_month
+    """,
+    'related_bands': f"""
+        SELECT spotify_id, {RELATED_BANDS.sql('related_artist_popularity')} AS category, COUNT(*) AS count
+        FROM related_artists WHERE spotify_id = :spotify_id
+        GROUP BY category HAVING category >= 0 ORDER BY category
+    """,
+}
+
+_BANDS = {'track_bands': TRACK_BANDS, 'related_bands': RELATED_BANDS}
+
+# Box plots: os quartis são calculados sobre os valores do artista lidos do
+# banco, com a mesma função dos agregados em memória (o SQLite não tem quantis)
+_BOX_SOURCES = {
+    'track_box': ('tracks', 'popularity', 0),
+    'track_outliers': ('tracks', 'popularity', 1),
+    'related_box': ('related_artists', 'related_artist_popularity', 0),
+    'related_outliers': ('related_artists', 'related_artist_popularity', 1),
+}
+
+SUMMARY_QUERY = """
+    SELECT
+        :spotify_id AS spotify_id,
+        tracks.track_count, tracks.popularity_mean, tracks.popularity_max,
+        albums.album_count, albums.album_tracks_mean,
+        shows.show_count, places.show_countries, places.show_cities
+    FROM
+        (SELECT COUNT(*) AS track_count, AVG(popularity) AS popularity_mean, MAX(popularity) AS popularity_max
+         FROM tracks WHERE spotify_id = :spotify_id) AS tracks,
+        (SELECT COUNT(*) AS album_count, AVG(total_tracks) AS album_tracks_mean
+         FROM albums WHERE spotify_id = :spotify_id) AS albums,
+        (SELECT COUNT(*) AS show_count FROM events WHERE spotify_id = :spotify_id) AS shows,
+        (SELECT COUNT(DISTINCT country) AS show_countries,
+                COUNT(DISTINCT country || char(0) || venue_city) AS show_cities
+         FROM events WHERE spotify_id = :spotify_id AND country IS NOT NULL) AS places
+"""
+
+# Rankings de todo o catálogo (ver core/leaderboards.py), restritos aos artistas
+# do catálogo, do maior para o menor valor
+_CATALOG = 'spotify_id IN (SELECT spotify_id FROM artists)'
+
+LEADERBOARD_QUERIES = {
+    'touring': f"""
+        SELECT spotify_id, COUNT(*) AS value FROM events WHERE {_CATALOG}
+        GROUP BY spotify_id ORDER BY value DESC, spotify_id LIMIT :limit
+    """,
+    'countries': f"""
+        SELECT spotify_id, COUNT(DISTINCT country) AS value FROM events WHERE {_CATALOG} AND country IS NOT NULL
+        GROUP BY spotify_id ORDER BY value DESC, spotify_id LIMIT :limit
+    """,
+    'popularity': f"""
+        SELECT spotify_id, AVG(popularity) AS value FROM tracks WHERE {_CATALOG}
+        GROUP BY spotify_id HAVING COUNT(*) >= :min_tracks ORDER BY value DESC, spotify_id LIMIT :limit
+    """,
+    'decades': f"""
+        SELECT decade, spotify_id, value FROM (
+            SELECT (release_date / 10) * 10 AS decade, spotify_id, COUNT(*) AS value,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY (release_date / 10) * 10 ORDER BY COUNT(*) DESC, spotify_id
+                   ) AS position
+            FROM albums WHERE {_CATALOG} AND type IS NOT NULL AND release_date IS NOT NULL
+            GROUP BY decade, spotify_id
+        ) WHERE position <= :limit ORDER BY decade, value DESC, spotify_id
+    """,
+}
+
+
+def backend_enabled():
+    """As consultas por artista usam o banco SQLite em vez das tabelas em memória."""
+    return os.environ.get('PULSE_BACKEND') == 'sqlite'
+
+
+def _to_sql_frame(df):
+    """Cópia de ``df`` com as datas como texto ISO."""
+    dates = {
+        col: df[col].dt.tz_localize(None) if df[col].dt.tz is not None else df[col]
+        for col in _DATE_FORMATS if col in df.columns
+    }
+    return df.assign(**{col: values.dt.strftime(_DATE_FORMATS[col]) for col, values in dates.items()})
+
+
+def build_database(path=DATABASE_PATH):
+    """Grava as tabelas de ``data/`` no banco ``path``, com os índices das consultas por artista."""
+    tables = {name: read_table(name) for name in TABLES if name != 'events'}
+    tables['events'] = read_events().drop(columns='event_key')
+
+    # Gravado em um arquivo temporário e trocado de uma vez: processos que já
+    # leem o banco anterior não veem um banco pela metade
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.unlink(missing_ok=True)
+    with closing(sqlite3.connect(tmp)) as conn:
+        for name, df in tables.items():
+            if name != 'artists':
+                # Mesma ordem das tabelas em memória: as linhas de cada artista
+                # ficam na ordem do arquivo (ou por data, nos eventos)
+                df = df.sort_values('spotify_id', kind='stable')
+            _to_sql_frame(df).to_sql(name, conn, index=False, chunksize=10_000)
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.execute('ANALYZE')
+        conn.commit()
+    tmp.replace(path)
+    return tables
+
+
+def database_is_fresh(path=DATABASE_PATH):
+    """O banco existe e é mais recente que todos os CSVs de origem e o gazetteer."""
+    if not path.exists():
+        return False
+    sources = [DATA_DIR / SCHEMAS[name]['file'] for name in SOURCE_TABLES]
+    sources += [GAZETTEER_DIR / file for file in GAZETTEER_FILES]
+    return path.stat().st_mtime >= max(p.stat().st_mtime for p in sources)
+
+
+class Database:
+    """Consultas por artista ao banco SQLite, com uma conexão somente leitura por thread."""
+
+    def __init__(self, path=DATABASE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, **params):
+        """Resultado da consulta como DataFrame."""
+        return pd.read_sql_query(sql, self._connection(), params=params)
+
+    def rows(self, name, spotify_id):
+        """Linhas do artista na tabela ``name``, na mesma ordem e com os mesmos tipos das tabelas em memória."""
+        order = 'event_date, rowid' if name == 'events' else 'rowid'
+        df = self.query(f'SELECT * FROM {name} WHERE spotify_id = :spotify_id ORDER BY {order}', spotify_id=spotify_id)
+
+        for col, fmt in _DATE_FORMATS.items():
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], format=fmt, errors='coerce')
+        if 'start_time_utc' in df.columns:
+            df['start_time_utc'] = df['start_time_utc'].dt.tz_localize('UTC')
+        return df.astype({col: kind for col, kind in _DTYPES[name].items() if col in df.columns})
+
+    def aggregate(self, name, spotify_id, limit=None):
+        """Agregado ``name`` do artista, calculado no banco; ``limit`` mantém apenas as primeiras linhas."""
+        if name in _BOX_SOURCES:
+            table, column, part = _BOX_SOURCES[name]
+            values = self.query(
+                f'SELECT spotify_id, {column} FROM {table} WHERE spotify_id = :spotify_id', spotify_id=spotify_id
+            )
+            stats = box_stats(values, column)[part]
+            return stats if limit is None else stats.head(limit)
+
+        df = self.query(
+            f'{AGGREGATE_QUERIES[name]} LIMIT :limit',
+            spotify_id=spotify_id,
+            limit=-1 if limit is None else limit,
+        )
+        if name in _BANDS:
+            df['category'] = pd.Categorical.from_codes(df['category'], dtype=_BANDS[name].dtype)
+        return df
+
+    def leaderboard(self, name, limit, min_tracks):
+        """Ranking ``name`` de todo o catálogo, calculado no banco."""
+        return self.query(LEADERBOARD_QUERIES[name], limit=limit, min_tracks=min_tracks)
+
+    def summary(self, spotify_id):
+        """Resumo numérico do artista, ou None se ele não aparecer em nenhuma tabela."""
+        summary = self.query(SUMMARY_QUERY, spotify_id=spotify_id).iloc[0]
+        if summary[['track_count', 'album_count', 'show_count']].sum() == 0:
+            return None
+        return summary
+
+
+@st.cache_resource(show_spinner=False)
+def load_database():
+    """Banco compartilhado pelo processo; gerado se estiver ausente ou desatualizado."""
+    if not database_is_fresh():
+        build_database()
+    return Database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o banco SQLite do Pulse a partir dos CSVs.")
+    parser.add_argument('--output', default=str(DATABASE_PATH), help="arquivo do banco")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tables = build_database(Path(args.output))
+    elapsed = time.perf_counter() - start
+
+    for name, df in tables.items():
+        print(f"{name}: {len(df)} linhas")
+    print(f"Banco gravado em {args.output} ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
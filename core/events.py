@@ -0,0 +1,45 @@
+"""
+Shows passados e futuros de um artista, relativos ao momento da consulta.
+
+A tabela ``events`` (ver ``read_events`` em core/data.py e core/ingest.py)
+guarda todos os shows ordenados por (spotify_id, event_date). Dentro da fatia
+de um artista, o ponto de corte entre passado e futuro é encontrado por busca
+binária na data, então a divisão acompanha a data atual sem que os arquivos
+precisem ser regerados.
+"""
+import pandas as pd
+
+from core.database import backend_enabled, load_database
+from core.ingest import load_event_store
+from core.metrics import timed
+
+
+@timed('filter')
+def split_events(spotify_id, now=None):
+    """
+    Divide os shows do artista em (passados, próximos), ambos em ordem cronológica.
+
+    Shows na data de hoje contam como próximos. ``now`` permite fixar o
+    instante de referência; por padrão, o horário atual.
+    """
+    if backend_enabled():
+        events = load_database().rows('events', spotify_id)
+    else:
+        events = load_event_store().rows(spotify_id)
+    today = (pd.Timestamp.now() if now is None else pd.Timestamp(now)).normalize()
+    cut = events['event_date'].searchsorted(today, side='left')
+    return events.iloc[:cut], events.iloc[cut:]
+
+
+def event_url(event, column='event_url'):
+    """URL completa de um evento a partir do modelo compactado (ver ``compact_urls`` em core/data.py)."""
+    template = event[f'{column}_template']
+    if pd.isna(template):
+        return None
+    return template.replace('{id}', str(event['event_id'])).replace('{slug}', str(event['url_slug']))
+
+
+def show_time(event):
+    """Horário do show no fuso do local, com o fuso quando conhecido (ex.: "21:00 (America/Sao_Paulo)")."""
+    time = event['start_time'].strftime('%H:%M')
+    return f"{time} ({event['timezone']})" if pd.notna(event['timezone']) else time
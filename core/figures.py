@@ -0,0 +1,123 @@
+"""
+Cache de figuras Plotly com despejo LRU.
+
+As figuras são indexadas por (spotify_id, identificador do gráfico, versão dos
+dados) e mantidas enquanto couberem no orçamento de memória; ao ultrapassá-lo,
+as menos usadas recentemente são descartadas. O tamanho de cada figura é
+estimado a partir dos dados dos seus traços e do layout, sem serializá-la: a
+única serialização é a feita pelo ``st.plotly_chart``.
+
+O cache guarda a própria figura, e não o JSON: ``st.plotly_chart`` só aceita
+figuras ou dicionários, e um dicionário é revalidado (reconstruído como
+``go.Figure``) a cada chamada, o que custa quase tanto quanto criar a figura.
+As figuras em cache são compartilhadas entre sessões e não devem ser alteradas
+depois de construídas.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+from core.data import data_version
+from core.metrics import count, timer
+
+# Orçamento de memória do cache, medido pelo tamanho estimado das figuras
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _nbytes(value):
+    """Tamanho aproximado de um valor da figura: arrays pelo buffer, textos pelo comprimento."""
+    if isinstance(value, dict):
+        return sum(len(key) + _nbytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return sum(len(str(item)) for item in value.flat)
+        return value.nbytes
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+def figure_size(figure):
+    """Tamanho estimado da figura, em bytes, sem serializá-la."""
+    # _data e _layout são os dicionários que a própria figura serializa; as
+    # propriedades públicas (data, layout) criariam objetos a cada acesso
+    return _nbytes(figure._data) + _nbytes(figure._layout)
+
+
+class FigureCache:
+    """Cache LRU limitado pelo tamanho total das figuras."""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Retorna a figura em cache, marcando-a como usada recentemente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, figure):
+        """Guarda a figura e descarta as menos usadas até caber no orçamento."""
+        nbytes = figure_size(figure)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (figure, nbytes)
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+@st.cache_resource(show_spinner=False)
+def load_figure_cache():
+    """Cache de figuras compartilhado pelo processo."""
+    return FigureCache()
+
+
+def cached_figure(spotify_id, chart_id, build):
+    """
+    Retorna a figura ``chart_id`` do artista, construindo-a com ``build()``
+    apenas quando ela ainda não estiver em cache para a versão atual dos dados.
+    """
+    cache = load_figure_cache()
+    key = (spotify_id, chart_id, data_version())
+    figure = cache.get(key)
+    if figure is None:
+        count('figure_cache_miss')
+        with timer('figures'):
+            figure = build()
+        cache.put(key, figure)
+    else:
+        count('figure_cache_hit')
+    return figure
+
+
+def show_figure(figure, use_container_width=True):
+    """Exibe a figura na página, medindo o envio na fase ``render``."""
+    with timer('render'):
+        st.plotly_chart(figure, use_container_width=use_container_width)
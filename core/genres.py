@@ -0,0 +1,118 @@
+"""
+Tabela normalizada de gêneros.
+
+Os gêneros chegam como texto separado por vírgulas (``genres`` em
+artists.csv e ``related_artist_genres`` em related_artists.csv). No
+carregamento, essas listas são quebradas uma única vez em uma tabela longa
+(linha de origem, código do gênero) com um vocabulário de gêneros codificado
+em inteiros, compartilhado pelas duas tabelas.
+
+A tabela longa fica em formato compacto: os códigos de cada linha de origem
+ocupam o intervalo ``codes[offsets[i]:offsets[i + 1]]``. Como related_artists
+é ordenada por artista, os gêneros de todos os relacionados de um artista
+também formam um único intervalo contíguo, e contagens, gêneros únicos e
+agrupamento por gênero principal viram operações inteiras (bincount).
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.data import load_table
+from core.index import load_artist_index
+from core.metrics import timed
+
+
+def split_genres(genres):
+    """
+    Quebra uma coluna de listas de gêneros em uma tabela longa.
+
+    Retorna um DataFrame com a linha de origem (``row``) e o gênero
+    normalizado (sem espaços extras e em minúsculas), na ordem da lista.
+    """
+    exploded = genres.reset_index(drop=True).str.split(',').explode()
+    names = exploded.str.strip().str.casefold()
+    long = pd.DataFrame({'row': exploded.index.to_numpy(), 'genre': names.to_numpy()})
+    return long[long['genre'].notna() & (long['genre'] != '')].reset_index(drop=True)
+
+
+class GenreLists:
+    """Listas de códigos de gênero por linha, em formato compacto (offsets + códigos)."""
+
+    def __init__(self, long, n_rows, vocabulary):
+        self.codes = pd.Categorical(long['genre'], categories=vocabulary).codes.astype(np.int32)
+        counts = np.bincount(long['row'].to_numpy(), minlength=n_rows)
+        self.offsets = np.r_[0, np.cumsum(counts)]
+
+        # Gênero principal (primeiro da lista) de cada linha; -1 se não houver
+        self.first = np.full(n_rows, -1, dtype=np.int32)
+        has_genres = counts > 0
+        self.first[has_genres] = self.codes[self.offsets[:-1][has_genres]]
+
+    def span(self, start, stop):
+        """Códigos de todas as linhas no intervalo [start, stop)."""
+        return self.codes[self.offsets[start]:self.offsets[stop]]
+
+    def row(self, row):
+        """Códigos dos gêneros de uma única linha."""
+        return self.span(row, row + 1)
+
+
+class GenreIndex:
+    """Vocabulário de gêneros e listas de gêneros de artistas e artistas relacionados."""
+
+    def __init__(self, artists_df, related_df):
+        artist_long = split_genres(artists_df['genres'])
+        related_long = split_genres(related_df['related_artist_genres'])
+
+        self.vocabulary = pd.Index(
+            sorted(set(artist_long['genre']) | set(related_long['genre'])),
+            name='genre'
+        )
+        self.artists = GenreLists(artist_long, len(artists_df), self.vocabulary)
+        self.related = GenreLists(related_long, len(related_df), self.vocabulary)
+
+    def names(self, codes):
+        """Nomes dos gêneros a partir dos códigos."""
+        return self.vocabulary[codes]
+
+
+@st.cache_resource(show_spinner=False)
+def load_genres():
+    """Índice de gêneros compartilhado pelo processo."""
+    return GenreIndex(load_table('artists'), load_table('related_artists'))
+
+
+@timed('filter')
+def related_genre_counts(spotify_id):
+    """Frequência de cada gênero entre os artistas relacionados, da maior para a menor."""
+    genres = load_genres()
+    start, stop = load_artist_index('related_artists').bounds(spotify_id)
+    counts = np.bincount(genres.related.span(start, stop), minlength=len(genres.vocabulary))
+
+    present = np.flatnonzero(counts)
+    order = present[np.argsort(-counts[present], kind='stable')]
+    return pd.Series(counts[order], index=genres.names(order), name='count')
+
+
+@timed('filter')
+def related_main_genres(spotify_id):
+    """
+    Popularidade média e quantidade de artistas relacionados por gênero principal
+    (o primeiro gênero de cada artista).
+    """
+    genres = load_genres()
+    start, stop = load_artist_index('related_artists').bounds(spotify_id)
+    main = genres.related.first[start:stop]
+    popularity = load_table('related_artists')['related_artist_popularity'].to_numpy()[start:stop]
+
+    valid = main >= 0
+    n_genres = len(genres.vocabulary)
+    count = np.bincount(main[valid], minlength=n_genres)
+    total = np.bincount(main[valid], weights=popularity[valid], minlength=n_genres)
+
+    present = np.flatnonzero(count)
+    return pd.DataFrame({
+        'main_genre': genres.names(present),
+        'mean': total[present] / count[present],
+        'count': count[present],
+    })
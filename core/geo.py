@@ -0,0 +1,143 @@
+"""
+Geocodificação offline dos shows.
+
+O gazetteer em ``data/gazetteer/`` (derivado do GeoNames, CC BY 4.0) traz:
+
+- ``countries.csv``: centroide de cada país, pelo código ISO;
+- ``country_aliases.csv``: grafias alternativas de países e siglas de
+  estados/províncias usadas pelo Bandsintown (ex.: "Brasil", "TX", "ON"),
+  com a subdivisão (admin1) correspondente quando houver;
+- ``cities.csv``: coordenadas de cidades por país, subdivisão e nome
+  normalizado.
+
+No carregamento, cada par (país, cidade) distinto dos eventos é resolvido uma
+única vez com merges vetorizados e o resultado é propagado a todas as linhas,
+de modo que todo evento com país conhecido recebe latitude e longitude
+(da cidade ou, na falta dela, do país), sem nenhuma chamada de rede.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+GAZETTEER_DIR = Path(__file__).resolve().parent.parent / 'data' / 'gazetteer'
+
+GAZETTEER_FILES = ('countries.csv', 'country_aliases.csv', 'cities.csv')
+
+
+def place_key(values):
+    """Chave de comparação de nomes de lugares: sem acentos, espaços extras ou diferença de caixa."""
+    return (
+        values.astype('string')
+        .str.normalize('NFKD')
+        .str.replace(r'[̀-ͯ]', '', regex=True)
+        .str.casefold()
+        .str.strip()
+    )
+
+
+class Gazetteer:
+    """Tabelas indexadas de países e cidades."""
+
+    def __init__(self, countries, aliases, cities):
+        self.countries = countries.set_index('country_code')
+
+        # País a partir do nome canônico ou de uma grafia alternativa
+        by_name = pd.DataFrame({
+            'key': place_key(countries['country']),
+            'country_code': countries['country_code'],
+            'admin1': None,
+        })
+        by_alias = pd.DataFrame({
+            'key': place_key(aliases['alias']),
+            'country_code': aliases['country_code'],
+            'admin1': aliases['admin1'],
+        })
+        self.country_lookup = (
+            pd.concat([by_alias, by_name], ignore_index=True)
+            .drop_duplicates('key')
+            .set_index('key')
+        )
+
+        # Cidades por (país, subdivisão, nome) e, sem subdivisão, a mais populosa por (país, nome)
+        coords = ['lat', 'lon']
+        self.cities_by_admin = (
+            cities.drop_duplicates(['country_code', 'admin1', 'city_key'])
+            .set_index(['country_code', 'admin1', 'city_key'])[coords]
+        )
+        self.cities_by_country = (
+            cities.sort_values('population', ascending=False)
+            .drop_duplicates(['country_code', 'city_key'])
+            .set_index(['country_code', 'city_key'])[coords]
+        )
+
+    def resolve(self, countries, cities):
+        """
+        Resolve pares (país, cidade) em coordenadas.
+
+        Retorna um DataFrame alinhado às entradas com o país canônico, o
+        código ISO, a latitude/longitude do país e a da cidade (ou do país,
+        quando a cidade não estiver no gazetteer) e a precisão obtida.
+        """
+        places = pd.DataFrame({
+            'country_key': place_key(pd.Series(countries)).to_numpy(dtype=object, na_value=None),
+            'city_key': place_key(pd.Series(cities)).to_numpy(dtype=object, na_value=None),
+        })
+        places = places.join(self.country_lookup, on='country_key')
+        places = places.join(self.countries, on='country_code')
+        places = places.rename(columns={'lat': 'country_lat', 'lon': 'country_lon'})
+
+        by_admin = places.join(self.cities_by_admin, on=['country_code', 'admin1', 'city_key'])
+        by_country = places.join(self.cities_by_country, on=['country_code', 'city_key'])
+        city_lat = by_admin['lat'].fillna(by_country['lat'])
+        city_lon = by_admin['lon'].fillna(by_country['lon'])
+
+        found_city = city_lat.notna()
+        found_country = places['country_lat'].notna()
+        return pd.DataFrame({
+            'country': places['country'],
+            'country_code': places['country_code'],
+            'country_lat': places['country_lat'],
+            'country_lon': places['country_lon'],
+            'lat': city_lat.fillna(places['country_lat']),
+            'lon': city_lon.fillna(places['country_lon']),
+            'geo_precision': np.select([found_city, found_country], ['city', 'country'], default=None),
+        })
+
+    def geocode(self, events):
+        """Acrescenta as colunas de :meth:`resolve` aos eventos (pela cidade e país do local)."""
+        pairs = events[['venue_country', 'venue_city']].astype(object)
+        codes = pairs.groupby(['venue_country', 'venue_city'], dropna=False, sort=False).ngroup()
+        uniques = pairs.drop_duplicates()
+
+        resolved = self.resolve(uniques['venue_country'], uniques['venue_city'])
+        resolved = resolved.iloc[codes.to_numpy()]
+        resolved.index = events.index
+
+        geocoded = pd.concat([events, resolved], axis=1)
+        return geocoded.astype({
+            'country': 'category',
+            'country_code': 'category',
+            'geo_precision': 'category',
+            'lat': 'float64',
+            'lon': 'float64',
+            'country_lat': 'float64',
+            'country_lon': 'float64',
+        })
+
+
+def read_gazetteer(directory=GAZETTEER_DIR):
+    """Lê os arquivos do gazetteer."""
+    # Códigos como "NA" (Namíbia) e subdivisões como "08" precisam ser lidos como texto
+    text = {'country_code': str, 'admin1': str}
+    return Gazetteer(*(
+        pd.read_csv(directory / file, dtype=text, keep_default_na=False, na_values=[''])
+        for file in GAZETTEER_FILES
+    ))
+
+
+@st.cache_resource(show_spinner=False)
+def load_gazetteer():
+    """Gazetteer compartilhado pelo processo."""
+    return read_gazetteer()
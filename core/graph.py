@@ -0,0 +1,149 @@
+"""
+Grafo de artistas relacionados.
+
+A lista de arestas de related_artists.csv (spotify_id → related_artist_id) é
+compilada no carregamento em uma matriz de adjacência compacta (CSR), com ids
+inteiros para os nós. Cada aresta tem peso proporcional à popularidade do
+artista de destino, normalizado por nó de origem, o que define as transições
+usadas tanto na expansão de vizinhança (2 e 3 saltos) quanto no PageRank.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.data import load_table
+from core.metrics import timed
+
+
+class ArtistGraph:
+    """Grafo direcionado de artistas em formato CSR (indptr, indices, transition)."""
+
+    def __init__(self, related_df, artists_df):
+        sources = related_df['spotify_id'].astype(str).to_numpy()
+        targets = related_df['related_artist_id'].astype(str).to_numpy()
+
+        codes, self.ids = pd.factorize(np.concatenate([sources, targets]))
+        n_edges = len(sources)
+        src, dst = codes[:n_edges], codes[n_edges:]
+        self.n_nodes = len(self.ids)
+        self.node_of = {spotify_id: node for node, spotify_id in enumerate(self.ids)}
+
+        # Nome e popularidade de cada nó: primeiro dos artistas relacionados,
+        # depois sobrescritos pelos dados da tabela de artistas, quando houver
+        self.names = np.empty(self.n_nodes, dtype=object)
+        self.popularity = np.zeros(self.n_nodes, dtype=np.int16)
+        self.names[dst] = related_df['related_artist_name'].to_numpy()
+        self.popularity[dst] = related_df['related_artist_popularity'].to_numpy()
+        known = artists_df['spotify_id'].astype(str).map(self.node_of)
+        mask = known.notna().to_numpy()
+        known_nodes = known[mask].astype(int).to_numpy()
+        self.names[known_nodes] = artists_df['artist_name'].to_numpy()[mask]
+        self.popularity[known_nodes] = artists_df['popularity'].to_numpy()[mask]
+
+        # CSR: arestas agrupadas por nó de origem
+        order = np.argsort(src, kind='stable')
+        degree = np.bincount(src, minlength=self.n_nodes)
+        self.indptr = np.r_[0, np.cumsum(degree)]
+        self.indices = dst[order].astype(np.int32)
+
+        # Peso = popularidade do destino + 1 (artistas com popularidade 0 continuam alcançáveis)
+        weights = related_df['related_artist_popularity'].to_numpy()[order].astype(float) + 1.0
+        out_weight = np.bincount(src[order], weights=weights, minlength=self.n_nodes)
+        self.edge_sources = src[order].astype(np.int32)
+        self.transition = weights / out_weight[self.edge_sources]
+        self.dangling = degree == 0
+
+        self.centrality = self.pagerank()
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def _out_edges(self, nodes):
+        """Posições (no vetor de arestas) de todas as arestas que saem de ``nodes``."""
+        starts = self.indptr[nodes]
+        lengths = self.indptr[nodes + 1] - starts
+        total = int(lengths.sum())
+        owners = np.repeat(np.arange(len(nodes)), lengths)
+        shift = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+        return owners, shift + np.arange(total)
+
+    def expand(self, spotify_id, hops=3, decay=0.5):
+        """
+        Vizinhança de até ``hops`` saltos a partir do artista.
+
+        A pontuação de cada nó soma a probabilidade de alcançá-lo seguindo as
+        transições ponderadas por popularidade, com peso ``decay`` por salto
+        adicional. Retorna um DataFrame com o nó, o menor número de saltos até
+        ele e a pontuação, sem incluir o próprio artista.
+        """
+        seed = self.node_of.get(spotify_id)
+        empty = pd.DataFrame({'node': np.array([], dtype=int), 'hop': np.array([], dtype=int), 'score': []})
+        if seed is None:
+            return empty
+
+        frontier = np.array([seed])
+        frontier_score = np.array([1.0])
+        found_nodes, found_scores, found_hops = [], [], []
+
+        for hop in range(1, hops + 1):
+            owners, edges = self._out_edges(frontier)
+            if len(edges) == 0:
+                break
+            contribution = frontier_score[owners] * self.transition[edges]
+            frontier, inverse = np.unique(self.indices[edges], return_inverse=True)
+            frontier_score = np.bincount(inverse, weights=contribution)
+
+            found_nodes.append(frontier)
+            found_scores.append(frontier_score * decay ** (hop - 1))
+            found_hops.append(np.full(len(frontier), hop))
+
+        if not found_nodes:
+            return empty
+
+        nodes, inverse = np.unique(np.concatenate(found_nodes), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(found_scores))
+        min_hop = np.full(len(nodes), hops + 1)
+        np.minimum.at(min_hop, inverse, np.concatenate(found_hops))
+
+        keep = nodes != seed
+        return pd.DataFrame({'node': nodes[keep], 'hop': min_hop[keep], 'score': scores[keep]})
+
+    @timed('filter')
+    def discover(self, spotify_id, limit=15, hops=3):
+        """
+        Recomendações além dos relacionados diretos: artistas a 2 ou 3 saltos,
+        ordenados pela pontuação da expansão.
+        """
+        neighborhood = self.expand(spotify_id, hops=hops)
+        further = neighborhood[neighborhood['hop'] >= 2].nlargest(limit, 'score')
+        nodes = further['node'].to_numpy()
+        return pd.DataFrame({
+            'spotify_id': self.ids[nodes],
+            'artist_name': self.names[nodes],
+            'popularity': self.popularity[nodes],
+            'hop': further['hop'].to_numpy(),
+            'score': further['score'].to_numpy(),
+            'centrality': self.centrality[nodes],
+        })
+
+    def pagerank(self, damping=0.85, tol=1e-10, max_iter=100):
+        """PageRank ponderado por iteração de potência."""
+        n = self.n_nodes
+        if n == 0:
+            return np.array([])
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(self.indices, weights=rank[self.edge_sources] * self.transition, minlength=n)
+            updated = damping * (spread + rank[self.dangling].sum() / n) + (1.0 - damping) / n
+            converged = np.abs(updated - rank).sum() < tol
+            rank = updated
+            if converged:
+                break
+        return rank
+
+
+@st.cache_resource(show_spinner=False)
+def load_graph():
+    """Grafo compartilhado pelo processo."""
+    return ArtistGraph(load_table('related_artists'), load_table('artists'))
@@ -0,0 +1,110 @@
+"""
+Cabeçalho do artista compartilhado pelas páginas.
+
+O HTML do cabeçalho (foto, nome e link do Spotify; na visão geral, também
+tipo, gênero, país, gêneros musicais e cartões de popularidade e seguidores)
+é montado uma única vez por artista e versão dos dados, guardado no cache do
+processo e enviado como um único elemento ``st.markdown``.
+"""
+from html import escape
+
+import pandas as pd
+import streamlit as st
+
+from config import COLORS
+from core.catalog import artist_record, load_catalog
+from core.data import data_version
+
+SPOTIFY_LOGO = 'https://upload.wikimedia.org/wikipedia/commons/1/19/Spotify_logo_without_text.svg'
+
+
+def _image_url(artist, size):
+    if pd.notna(artist['image_url']):
+        return artist['image_url']
+    return f'https://via.placeholder.com/{size}x{size}?text=No+Image'
+
+
+def _title(artist):
+    """Nome do artista com o link para o Spotify."""
+    return f"""
+        <div style='display: flex; align-items: center;'>
+            <h2 style='color: white; margin-bottom: 0;'>{escape(artist['artist_name'])}</h2>
+            <a href='{artist['spotify_url']}' target='_blank' style='margin-left: -20px; text-decoration: none;'>
+                <img src='{SPOTIFY_LOGO}' width='20'>
+            </a>
+        </div>"""
+
+
+def _field(label, value, align='center'):
+    return f"""
+        <div style='display: flex; align-items: {align}; margin-bottom: 8px;'>
+            <span style='color: {COLORS["accent"]}; font-weight: 500; min-width: 80px;'>{label}:</span>
+            <span style='color: white;'>{escape(str(value))}</span>
+        </div>"""
+
+
+def _card(label, value, suffix='', margin='0'):
+    suffix = f"<span style='color: {COLORS['accent']}; font-size: 0.9em; line-height: 1;'>{suffix}</span>" if suffix else ''
+    return f"""
+        <div style='background-color: {COLORS["secondary"]}; padding: 12px; border-radius: 10px; margin: {margin};'>
+            <div style='text-align: center; display: flex; flex-direction: column; align-items: center;'>
+                <p style='color: white; margin: 0; font-size: 0.9em; font-weight: 500; line-height: 1.2;'>{label}</p>
+                <div style='display: flex; align-items: center; justify-content: center; margin-top: 4px;'>
+                    <p style='color: white; margin: 0; margin-right: 5px; font-size: 1.5em; font-weight: 700; line-height: 1;'>{value}</p>
+                    {suffix}
+                </div>
+            </div>
+        </div>"""
+
+
+def compact_header(artist):
+    """Foto pequena, nome e link do Spotify (páginas de análise)."""
+    return f"""
+    <div style='display: flex; align-items: center; gap: 1.5rem; margin-bottom: 2rem;'>
+        <img src='{_image_url(artist, 100)}' style='border-radius: 10px; object-fit: cover; object-position: center; width: 100px; height: 100px;'>
+        {_title(artist)}
+    </div>"""
+
+
+def full_header(artist):
+    """Foto grande, dados do artista e métricas do Spotify (visão geral)."""
+    fields = _field('Tipo', artist['artist_type'].title())
+    # Gênero (se não for grupo)
+    if artist['artist_type'].lower() != 'banda':
+        fields += _field('Gênero', artist['gender'].title())
+    fields += _field('País', artist['country'])
+    fields += _field('Gêneros', artist['genres'], align='flex-start')
+
+    return f"""
+    <div style='display: flex; gap: 1.5rem; margin-bottom: 1rem;'>
+        <div style='flex: 1;'>
+            <img src='{_image_url(artist, 300)}' style='border-radius: 10px; object-fit: cover; object-position: center; width: 300px; height: 300px;'>
+        </div>
+        <div style='flex: 1.5;'>
+            {_title(artist)}
+            {fields}
+        </div>
+        <div style='flex: 1;'>
+            {_card('Popularidade no Spotify', int(artist['popularity']), suffix='/ 100', margin='75px 0 10px 0')}
+            {_card('Seguidores no Spotify', f"{int(artist['followers']):,}")}
+        </div>
+    </div>"""
+
+
+HEADERS = {
+    'compact': compact_header,
+    'full': full_header,
+}
+
+
+@st.cache_resource(show_spinner=False, max_entries=1024)
+def header_html(spotify_id, variant, version):
+    """HTML do cabeçalho do artista; ``version`` invalida a entrada quando os dados mudam."""
+    artist = artist_record(load_catalog().names_by_id[spotify_id])
+    return HEADERS[variant](artist)
+
+
+def artist_header(variant='compact'):
+    """Exibe o cabeçalho do artista selecionado em um único elemento."""
+    html = header_html(st.session_state.selected_artist_id, variant, data_version())
+    st.markdown(html, unsafe_allow_html=True)
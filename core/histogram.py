@@ -0,0 +1,77 @@
+"""
+Histogramas calculados no servidor.
+
+``px.histogram`` envia todas as linhas ao navegador, que faz a contagem por
+faixa em JavaScript. Aqui a contagem é feita com NumPy e a figura recebe apenas
+as faixas e suas contagens, desenhadas como barras contíguas; o tamanho da
+figura depende do número de faixas, e não do número de linhas.
+
+As faixas seguem a mesma regra do Plotly para ``nbins``: um tamanho "redondo"
+(1, 2, 2,5 ou 5 vezes uma potência de 10) que gere no máximo ``nbins`` faixas,
+e, para valores inteiros, tamanho inteiro e limites deslocados em meia unidade,
+para que nenhum valor caia sobre um limite.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def _bin_size(span, nbins, integer):
+    """Menor tamanho "redondo" de faixa que cobre ``span`` em até ``nbins`` faixas."""
+    raw = span / nbins if span > 0 else 1
+    magnitude = 10 ** math.floor(math.log10(raw))
+    steps = (1, 2, 5, 10) if integer else (1, 2, 2.5, 5, 10)
+    size = next(step * magnitude for step in steps if step * magnitude >= raw)
+    return max(1, round(size)) if integer else size
+
+
+def histogram_bins(values, nbins):
+    """
+    Faixas do histograma de ``values``: início, fim, centro e contagem de cada uma.
+
+    Valores ausentes são ignorados; sem valores, o resultado é vazio.
+    """
+    values = pd.Series(values).dropna().to_numpy(dtype=float)
+    if len(values) == 0:
+        return pd.DataFrame({'start': [], 'stop': [], 'center': [], 'count': []})
+
+    low, high = values.min(), values.max()
+    integer = bool(np.all(values == np.round(values)))
+    size = _bin_size(high - low, nbins, integer)
+    start = math.floor(low / size) * size - (0.5 if integer else 0)
+    edges = start + size * np.arange(math.floor((high - start) / size) + 2)
+
+    counts, _ = np.histogram(values, bins=edges)
+    return pd.DataFrame({
+        'start': edges[:-1],
+        'stop': edges[1:],
+        'center': (edges[:-1] + edges[1:]) / 2,
+        'count': counts,
+    })
+
+
+def histogram_figure(bins, x_label, count_label, color, **kwargs):
+    """
+    Figura de barras contíguas a partir de ``histogram_bins``, com a aparência de ``px.histogram``.
+
+    ``kwargs`` são repassados a ``px.bar`` (ex.: ``title``, ``height``, ``width``).
+    """
+    import plotly.express as px
+
+    fig = px.bar(
+        bins,
+        x='center',
+        y='count',
+        labels={'center': x_label, 'count': count_label},
+        color_discrete_sequence=[color],
+        custom_data=['start', 'stop'],
+        **kwargs
+    )
+    size = float(bins['stop'].iloc[0] - bins['start'].iloc[0]) if not bins.empty else 1
+    fig.update_traces(
+        width=size,
+        hovertemplate=f'{x_label}=%{{customdata[0]:g}} - %{{customdata[1]:g}}<br>{count_label}=%{{y}}<extra></extra>',
+    )
+    fig.update_layout(bargap=0)
+    return fig
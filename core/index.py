@@ -0,0 +1,100 @@
+"""
+Índice de linhas por artista.
+
+As tabelas de ARTIST_TABLES são ordenadas por spotify_id no carregamento, então
+as linhas de cada artista formam um intervalo contíguo. O índice guarda esse
+intervalo por artista e permite obter a fatia de um artista em tempo constante,
+sem varrer a tabela inteira nem copiar os dados.
+
+A tabela de eventos, que recebe linhas novas sem reiniciar o processo, mantém
+o próprio índice (ver core/ingest.py); ``replace_artists`` atualiza uma tabela
+ordenada trocando apenas as fatias dos artistas alterados.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.data import load_table
+from core.database import backend_enabled, load_database
+from core.metrics import timed
+
+
+class ArtistIndex:
+    """Mapeia spotify_id para o intervalo [início, fim) de linhas de uma tabela ordenada."""
+
+    def __init__(self, spotify_ids):
+        codes = spotify_ids.cat.codes.to_numpy()
+        categories = spotify_ids.cat.categories
+
+        if len(codes) == 0:
+            self._bounds = {}
+            return
+
+        # Fronteiras entre artistas: posições em que o código muda
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        stops = np.r_[starts[1:], len(codes)]
+        present = codes[starts] >= 0
+        starts, stops = starts[present], stops[present]
+        # Categorias buscadas de uma vez: o acesso item a item ao Index custa
+        # mais que o resto da construção
+        artists = categories.take(codes[starts]).tolist()
+        self._bounds = dict(zip(artists, zip(starts.tolist(), stops.tolist())))
+
+    def bounds(self, spotify_id):
+        """Intervalo de linhas do artista; (0, 0) se ele não tiver linhas."""
+        return self._bounds.get(spotify_id, (0, 0))
+
+    def __contains__(self, spotify_id):
+        return spotify_id in self._bounds
+
+    def __len__(self):
+        return len(self._bounds)
+
+
+def replace_artists(df, index, artists, rows):
+    """
+    Cópia de ``df`` com as linhas dos ``artists`` substituídas por ``rows``.
+
+    ``df`` está ordenado por spotify_id (ver ``index``) e ``rows`` traz apenas
+    linhas desses artistas, já na ordem desejada dentro de cada um. A tabela não
+    é reordenada: as categorias novas entram no fim das existentes, o que
+    preserva a ordem dos códigos, e as linhas de cada artista vão para a posição
+    do artista, achada por busca binária nos códigos de spotify_id. O custo que
+    resta proporcional à tabela é a cópia das colunas (``concat`` + ``take``).
+    """
+    rows = rows.reset_index(drop=True)
+    categorical = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    for col in categorical:
+        categories = df[col].cat.categories
+        added = pd.Index(rows[col].dropna().astype(object).unique()).difference(categories)
+        if len(added):
+            categories = categories.append(added)
+            df = df.assign(**{col: df[col].cat.set_categories(categories)})
+        rows[col] = rows[col].astype(pd.CategoricalDtype(categories))
+
+    keep = np.ones(len(df), dtype=bool)
+    for artist in artists:
+        start, stop = index.bounds(artist)
+        keep[start:stop] = False
+    kept = np.flatnonzero(keep)
+
+    new_codes = rows['spotify_id'].cat.codes.to_numpy()
+    order = np.argsort(new_codes, kind='stable')
+    positions = np.searchsorted(df['spotify_id'].cat.codes.to_numpy()[kept], new_codes[order])
+    taken = np.insert(kept, positions, len(df) + order)
+    return pd.concat([df, rows], ignore_index=True).take(taken).reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner=False)
+def load_artist_index(name):
+    """Índice compartilhado pelo processo para a tabela ``name``."""
+    return ArtistIndex(load_table(name)['spotify_id'])
+
+
+@timed('filter')
+def artist_rows(name, spotify_id):
+    """Retorna as linhas do artista na tabela ``name`` como uma fatia sem cópia."""
+    if backend_enabled():
+        return load_database().rows(name, spotify_id)
+    start, stop = load_artist_index(name).bounds(spotify_id)
+    return load_table(name).iloc[start:stop]
@@ -0,0 +1,186 @@
+"""
+Ingestão incremental dos arquivos de eventos.
+
+Os arquivos de shows recebem novas linhas ao longo do tempo, sempre no fim. Em
+vez de reler os arquivos inteiros (ou exigir que o processo seja reiniciado), o
+``EventStore`` guarda, para cada arquivo, até onde ele já foi lido e, a cada
+consulta, verifica com um ``stat`` se o arquivo cresceu. Nesse caso lê apenas os
+bytes acrescentados, converte-os com o mesmo schema da leitura completa e os
+incorpora à tabela de eventos em memória e ao seu índice por artista:
+
+- cada linha recebe uma chave estável (``event_id`` ou hash do conteúdo, ver
+  ``identify_events`` em core/data.py), e uma linha nova substitui a de mesma
+  chave já carregada;
+- apenas linhas completas (terminadas em quebra de linha) são lidas; uma linha
+  ainda sendo escrita fica para a próxima consulta;
+- apenas as fatias dos artistas com linhas novas são reordenadas; o restante
+  da tabela é copiado na mesma ordem (ver ``EventStore._merge``);
+- se o arquivo encolheu, foi modificado sem crescer ou teve o trecho já lido
+  alterado, ele foi reescrito e a tabela é recarregada por inteiro.
+
+Cada versão publicada registra os artistas alterados, para que os agregados de
+shows recalculem apenas esses artistas (ver ``AggregateStore.sync_events`` em
+core/aggregates.py).
+"""
+import io
+import threading
+from collections import deque, namedtuple
+
+import pandas as pd
+import streamlit as st
+
+from core.data import DATA_DIR, EVENT_TABLES, SCHEMAS, combine_events, parse_table, prepare_events
+from core.index import ArtistIndex, replace_artists
+from core.metrics import count
+
+# Bytes finais do trecho já lido, comparados a cada leitura para detectar reescritas
+_TAIL_BYTES = 256
+
+# Versões recentes cujos artistas alterados ficam registrados
+_HISTORY = 64
+
+
+class EventSnapshot(namedtuple('EventSnapshot', ['generation', 'events', 'index', 'changes'])):
+    """
+    Versão publicada da tabela: número da versão, eventos, índice por artista e
+    os artistas alterados nas versões recentes, pares (versão, artistas), com
+    None para uma recarga completa.
+    """
+
+    def changed_since(self, generation):
+        """Artistas alterados depois da versão ``generation``, ou None se não for possível saber."""
+        newer = [artists for version, artists in self.changes if version > generation]
+        if len(newer) != self.generation - generation or None in newer:
+            return None
+        return set().union(*newer)
+
+
+class TrackedFile:
+    """Arquivo CSV lido de forma incremental, a partir do último byte já convertido."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.columns = None
+        self.offset = 0
+        self.mtime_ns = None
+        self.tail = b''
+
+    def read_all(self):
+        """Lê o arquivo inteiro e passa a acompanhá-lo a partir do fim."""
+        stat = self.path.stat()
+        data = self.path.read_bytes()
+        cut = data.rfind(b'\n') + 1
+        self.columns = pd.read_csv(io.BytesIO(data[:cut]), nrows=0).columns
+        self._advance(data[:cut], cut, stat)
+        return parse_table(self.name, io.BytesIO(data[:cut]), self.columns)
+
+    def read_appended(self):
+        """
+        Linhas acrescentadas desde a última leitura (None se não houver).
+
+        Levanta ``FileRewritten`` se o arquivo não foi apenas acrescido.
+        """
+        stat = self.path.stat()
+        if stat.st_size == self.offset and stat.st_mtime_ns == self.mtime_ns:
+            return None
+        if stat.st_size <= self.offset:
+            raise FileRewritten(self.path)
+
+        with self.path.open('rb') as f:
+            f.seek(self.offset - len(self.tail))
+            if f.read(len(self.tail)) != self.tail:
+                raise FileRewritten(self.path)
+            data = f.read()
+
+        cut = data.rfind(b'\n') + 1
+        if cut == 0:
+            return None
+        self._advance(data[:cut], self.offset + cut, stat)
+        return parse_table(self.name, io.BytesIO(data[:cut]), self.columns, header=False)
+
+    def _advance(self, data, offset, stat):
+        self.tail = (self.tail + data)[-_TAIL_BYTES:]
+        self.offset = offset
+        self.mtime_ns = stat.st_mtime_ns
+
+
+class FileRewritten(Exception):
+    """O arquivo foi alterado de forma diferente de um acréscimo no fim."""
+
+
+class EventStore:
+    """Tabela de eventos em memória, atualizada com as linhas acrescentadas aos arquivos."""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self._lock = threading.Lock()
+        self._files = [TrackedFile(name, data_dir / SCHEMAS[name]['file']) for name in EVENT_TABLES]
+        self._snapshot = None
+        self._changes = deque(maxlen=_HISTORY)
+        self._reload()
+
+    def _reload(self):
+        count('table_cache_miss')
+        frames = [prepare_events(file.read_all()) for file in self._files]
+        self._publish(combine_events(frames), None)
+
+    def _merge(self, batches):
+        """
+        Incorpora os lotes à tabela publicada; retorna a tabela e os artistas alterados.
+
+        Só os artistas com linhas nos lotes, ou com linhas substituídas por eles,
+        são reordenados: suas fatias e os lotes passam por ``combine_events`` e
+        voltam à posição do artista (ver ``replace_artists`` em core/index.py).
+        O restante da tabela não é concatenado nem ordenado de novo; o custo
+        proporcional à tabela é a busca das chaves substituídas (uma consulta a
+        uma tabela hash por linha) e a cópia das colunas.
+        """
+        events, index = self._snapshot.events, self._snapshot.index
+        if any(batch['spotify_id'].isna().any() for batch in batches):
+            return combine_events([events, *batches]), None
+
+        keys = pd.concat([batch['event_key'] for batch in batches])
+        replaced = events.loc[events['event_key'].isin(keys), 'spotify_id']
+        artists = set(replaced.dropna()).union(*(batch['spotify_id'] for batch in batches))
+        slices = [events.iloc[slice(*index.bounds(artist))] for artist in artists if artist in index]
+        # Ordem dos lotes: o mais recente prevalece sobre as linhas já carregadas
+        rows = combine_events([*slices, *batches])
+        return replace_artists(events, index, artists, rows), frozenset(artists)
+
+    def _publish(self, events, artists):
+        generation = 0 if self._snapshot is None else self._snapshot.generation + 1
+        self._changes.append((generation, artists))
+        # Reconstruir o índice é uma única passada vetorizada sobre spotify_id
+        self._snapshot = EventSnapshot(generation, events, ArtistIndex(events['spotify_id']), tuple(self._changes))
+
+    def snapshot(self):
+        """Incorpora as linhas novas dos arquivos, se houver, e retorna a versão atual."""
+        with self._lock:
+            try:
+                batches = [file.read_appended() for file in self._files]
+            except FileRewritten:
+                count('events_reload')
+                self._reload()
+                return self._snapshot
+
+            batches = [prepare_events(batch) for batch in batches if batch is not None and not batch.empty]
+            if batches:
+                count('events_ingested', sum(len(batch) for batch in batches))
+                self._publish(*self._merge(batches))
+            return self._snapshot
+
+    def refresh(self):
+        """Tabela de eventos atualizada, ordenada por (spotify_id, event_date)."""
+        return self.snapshot().events
+
+    def rows(self, spotify_id):
+        """Eventos do artista, atualizados, como uma fatia sem cópia."""
+        snapshot = self.snapshot()
+        start, stop = snapshot.index.bounds(spotify_id)
+        return snapshot.events.iloc[start:stop]
+
+
+@st.cache_resource(show_spinner=False)
+def load_event_store():
+    """Tabela de eventos compartilhada pelo processo."""
+    return EventStore()
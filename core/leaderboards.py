@@ -0,0 +1,101 @@
+"""
+Rankings de todo o catálogo.
+
+Cada ranking é calculado de uma vez para todos os artistas, com operações
+vetorizadas sobre os agregados por artista (ver core/aggregates.py), sobre o
+grafo de relacionados ou, com o backend em SQLite, no próprio banco. Nenhum
+deles percorre os artistas em Python, e apenas os LEADERBOARD_SIZE primeiros
+de cada ranking são guardados.
+
+Os rankings ficam em cache no processo. Os que dependem dos shows são
+recalculados quando a tabela de eventos recebe linhas novas (ver
+core/ingest.py); os demais são calculados uma única vez.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.aggregates import current_aggregates
+from core.catalog import load_catalog
+from core.database import backend_enabled, load_database
+from core.graph import load_graph
+from core.ingest import load_event_store
+from core.metrics import timed
+
+LEADERBOARD_SIZE = 10
+
+# Mínimo de músicas para entrar no ranking de popularidade média
+MIN_TRACKS = 5
+
+# Rankings que dependem da tabela de eventos
+EVENT_LEADERBOARDS = ('touring', 'countries')
+
+
+def _top(values, limit=LEADERBOARD_SIZE):
+    """Os maiores valores (Series indexada por spotify_id) entre os artistas do catálogo."""
+    catalog_ids = list(load_catalog().names_by_id)
+    values = values[values.index.isin(catalog_ids) & (values > 0)]
+    top = values.rename('value').rename_axis('spotify_id').reset_index()
+    top['spotify_id'] = top['spotify_id'].astype(str)
+    return top.sort_values(['value', 'spotify_id'], ascending=[False, True], kind='stable').head(limit)
+
+
+def _summary_column(column, min_tracks=0):
+    summary = current_aggregates().frame('artist_summary').set_index('spotify_id')
+    return summary.loc[summary['track_count'].fillna(0) >= min_tracks, column].dropna()
+
+
+def _decades(limit=LEADERBOARD_SIZE):
+    """Artistas com mais lançamentos em cada década."""
+    counts = (
+        current_aggregates().frame('album_decades')
+        .groupby(['decade', 'spotify_id'], observed=True)['count'].sum()
+        .rename('value')
+        .reset_index()
+    )
+    counts['spotify_id'] = counts['spotify_id'].astype(str)
+    counts = counts[counts['spotify_id'].isin(list(load_catalog().names_by_id))]
+    counts = counts.sort_values(['decade', 'value', 'spotify_id'], ascending=[True, False, True], kind='stable')
+    return counts.groupby('decade').head(limit)
+
+
+def _connected(limit=LEADERBOARD_SIZE):
+    """Artistas com mais ligações no grafo de relacionados (citados ou citando)."""
+    graph = load_graph()
+    degree = np.diff(graph.indptr) + np.bincount(graph.indices, minlength=graph.n_nodes)
+    return _top(pd.Series(degree, index=graph.ids), limit)
+
+
+def compute_leaderboard(name):
+    """Calcula o ranking ``name`` a partir das tabelas de todo o catálogo."""
+    if name == 'connected':
+        return _connected()
+    if backend_enabled():
+        return load_database().leaderboard(name, LEADERBOARD_SIZE, MIN_TRACKS)
+    if name == 'touring':
+        return _top(_summary_column('show_count'))
+    if name == 'countries':
+        return _top(_summary_column('show_countries'))
+    if name == 'popularity':
+        return _top(_summary_column('popularity_mean', MIN_TRACKS))
+    if name == 'decades':
+        return _decades()
+    raise KeyError(name)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _cached_leaderboard(name, generation):
+    board = compute_leaderboard(name)
+    names = load_catalog().names_by_id
+    return board.assign(artist_name=board['spotify_id'].map(names)).reset_index(drop=True)
+
+
+@timed('aggregation')
+def leaderboard(name):
+    """
+    Ranking ``name`` de todo o catálogo: spotify_id, artist_name e value (e
+    decade, no ranking por década), do maior para o menor valor.
+    """
+    in_memory_events = name in EVENT_LEADERBOARDS and not backend_enabled()
+    generation = load_event_store().snapshot().generation if in_memory_events else 0
+    return _cached_leaderboard(name, generation)
@@ -0,0 +1,227 @@
+"""
+Medição do tempo gasto em cada fase da execução das páginas.
+
+As funções do caminho crítico são marcadas com ``@timed(fase)`` (ou envolvidas
+em ``with timer(fase):``) e acumulam seu tempo na execução corrente, iniciada
+por ``begin_page`` e encerrada por ``end_page`` em ``streamlit_app.py``. Os
+fragmentos das páginas são declarados com ``@measured_fragment``: quando um
+deles é reexecutado sozinho, sem passar por ``streamlit_app.py``, a reexecução
+é medida como uma execução própria, com a página ``<página>/<fragmento>``. As
+fases são:
+
+- ``load``: carregamento das tabelas;
+- ``filter``: consultas do artista (fatias, gêneros, grafo, similaridade, shows);
+- ``aggregation``: consultas aos agregados pré-calculados;
+- ``figures``: construção das figuras Plotly (apenas as ausentes do cache);
+- ``render``: envio das figuras com ``st.plotly_chart``.
+
+Ao fim de cada execução, as medições podem ser:
+
+- exibidas em um painel na barra lateral, oculto por padrão, ativado com
+  ``?debug=1`` na URL ou com a variável de ambiente ``PULSE_DEBUG=1``;
+- gravadas no arquivo indicado por ``PULSE_METRICS_FILE``: uma linha JSON por
+  execução ou, se o arquivo terminar em ``.prom``, um retrato dos contadores
+  acumulados no formato texto do Prometheus.
+
+Sem uma execução iniciada (por exemplo, ao rodar uma página isolada), as
+medições são descartadas.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+PHASES = ('load', 'filter', 'aggregation', 'figures', 'render')
+
+_local = threading.local()
+
+
+class RunMetrics:
+    """Tempos e contadores de uma execução de página."""
+
+    def __init__(self, page):
+        self.page = page
+        self.start = time.perf_counter()
+        self.timings = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._depth = defaultdict(int)
+
+
+class MetricsRegistry:
+    """Totais acumulados pelo processo, por página, para a exportação no formato do Prometheus."""
+
+    def __init__(self):
+        self.runs = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, run):
+        with self._lock:
+            self.runs[run.page] += 1
+            for phase, seconds in run.timings.items():
+                self.seconds[run.page, phase] += seconds
+            for name, value in run.counts.items():
+                self.counts[run.page, name] += value
+
+    def prometheus(self):
+        """Contadores no formato texto do Prometheus."""
+        with self._lock:
+            lines = [
+                '# HELP pulse_page_runs_total Execuções completas de cada página.',
+                '# TYPE pulse_page_runs_total counter',
+            ]
+            lines += [f'pulse_page_runs_total{{page="{page}"}} {n}' for page, n in sorted(self.runs.items())]
+            lines += [
+                '# HELP pulse_phase_seconds_total Tempo gasto em cada fase da execução das páginas.',
+                '# TYPE pulse_phase_seconds_total counter',
+            ]
+            lines += [
+                f'pulse_phase_seconds_total{{page="{page}",phase="{phase}"}} {seconds:.6f}'
+                for (page, phase), seconds in sorted(self.seconds.items())
+            ]
+            lines += [
+                '# HELP pulse_events_total Acertos e faltas de cache e outros eventos contados nas páginas.',
+                '# TYPE pulse_events_total counter',
+            ]
+            lines += [
+                f'pulse_events_total{{page="{page}",event="{name}"}} {value}'
+                for (page, name), value in sorted(self.counts.items())
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+@st.cache_resource(show_spinner=False)
+def load_registry():
+    """Totais compartilhados pelo processo."""
+    return MetricsRegistry()
+
+
+def current_run():
+    """Execução em andamento nesta thread, ou None."""
+    return getattr(_local, 'run', None)
+
+
+def begin_page(page):
+    """Inicia a medição de uma execução da página."""
+    _local.run = RunMetrics(page)
+
+
+@contextmanager
+def timer(phase):
+    """Soma o tempo do bloco à fase; blocos aninhados da mesma fase contam uma vez."""
+    run = current_run()
+    if run is None:
+        yield
+        return
+    run._depth[phase] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run._depth[phase] -= 1
+        if run._depth[phase] == 0:
+            run.timings[phase] += time.perf_counter() - start
+
+
+def timed(phase):
+    """Decorador: mede cada chamada da função na fase ``phase``."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Incrementa um contador da execução corrente (ex.: acertos de cache)."""
+    run = current_run()
+    if run is not None:
+        run.counts[name] += n
+
+
+def debug_enabled():
+    return st.query_params.get('debug') == '1' or os.environ.get('PULSE_DEBUG') == '1'
+
+
+def _export(record):
+    path = os.environ.get('PULSE_METRICS_FILE')
+    if not path:
+        return
+    path = Path(path)
+    if path.suffix == '.prom':
+        # Retrato completo, substituído de forma atômica (coletor de arquivos de texto)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(load_registry().prometheus())
+        tmp.replace(path)
+    else:
+        with path.open('a') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def _debug_panel(record):
+    with st.sidebar.expander("⏱️ Desempenho", expanded=True):
+        st.caption(f"Página `{record['page']}` · {record['artist']}")
+        rows = [{'fase': phase, 'ms': ms} for phase, ms in record['timings_ms'].items()]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        for name, value in sorted(record['counts'].items()):
+            st.caption(f"{name}: {value}")
+
+
+def end_page(panel=True):
+    """
+    Encerra a execução corrente: acumula os totais, exporta e exibe o painel de
+    depuração (se ``panel``; fragmentos não podem escrever na barra lateral).
+    """
+    run = current_run()
+    if run is None:
+        return
+    _local.run = None
+    run.timings['total'] = time.perf_counter() - run.start
+    load_registry().add(run)
+
+    record = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'page': run.page,
+        'artist': st.session_state.get('selected_artist'),
+        'timings_ms': {phase: round(run.timings[phase] * 1000, 2) for phase in (*PHASES, 'total')},
+        'counts': dict(run.counts),
+    }
+    _export(record)
+    if panel and debug_enabled():
+        _debug_panel(record)
+
+
+def measured_fragment(func):
+    """
+    ``st.fragment`` cujas reexecuções isoladas também são medidas.
+
+    Dentro da execução da página, o fragmento soma seus tempos a ela; reexecutado
+    sozinho (por um widget do próprio fragmento), abre e encerra uma execução
+    com o nome ``<página>/<fragmento>``, em que a página é o arquivo de ``views/``.
+    """
+    name = f'{Path(func.__code__.co_filename).stem}/{func.__name__}'
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        ctx = get_script_run_ctx()
+        fragment_rerun = ctx is not None and bool(ctx.fragment_ids_this_run)
+        if current_run() is not None or not fragment_rerun:
+            return func(*args, **kwargs)
+        begin_page(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end_page(panel=False)
+
+    return st.fragment(wrapper)
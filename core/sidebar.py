@@ -0,0 +1,63 @@
+"""Seletor de artista da barra lateral, compartilhado por todas as páginas."""
+import streamlit as st
+
+from core.catalog import load_catalog
+
+# Máximo de opções enviadas ao navegador em cada execução
+SELECTOR_LIMIT = 200
+
+
+def _select_artist(key):
+    """Callback do seletor: aplica o novo artista antes da execução da página."""
+    catalog = load_catalog()
+    selected_artist = st.session_state[key]
+    st.session_state.selected_artist = selected_artist
+    st.session_state.selected_artist_id = catalog.ids[selected_artist]
+
+
+def artist_selector(key):
+    """
+    Exibe a busca e o seletor de artista na barra lateral.
+
+    Apenas os resultados da busca (até SELECTOR_LIMIT) são enviados como opções;
+    o artista atual é sempre mantido na lista. Retorna o nome selecionado.
+
+    A troca de artista é aplicada pelo callback ``on_change``, que o Streamlit
+    executa antes do script da página; assim a página roda uma única vez por
+    seleção, já com o novo artista, sem precisar de ``st.rerun()``.
+    """
+    catalog = load_catalog()
+    current = st.session_state.get('selected_artist')
+    if current not in catalog:
+        current = catalog.default
+
+    st.sidebar.markdown("### Procure seu artista favorito")
+    query = st.sidebar.text_input(
+        "Buscar",
+        key=f"{key}_search",
+        placeholder="Buscar artista...",
+        label_visibility="collapsed"
+    )
+
+    options = catalog.search(query, limit=SELECTOR_LIMIT)
+    if not options:
+        st.sidebar.caption("Nenhum artista encontrado.")
+    if current not in options:
+        options = [current] + options
+
+    selected_artist = st.sidebar.selectbox(
+        "Artista",
+        options=options,
+        index=options.index(current),
+        key=key,
+        on_change=_select_artist,
+        args=(key,),
+        label_visibility="collapsed"
+    )
+
+    # Primeira execução ou artista anterior fora do catálogo: usa o artista exibido
+    if selected_artist != st.session_state.get('selected_artist'):
+        st.session_state.selected_artist = selected_artist
+        st.session_state.selected_artist_id = catalog.ids[selected_artist]
+
+    return selected_artist
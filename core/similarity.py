@@ -0,0 +1,167 @@
+"""
+Similaridade entre artistas por gêneros.
+
+Cada artista (de artists.csv e do universo de artistas relacionados) é
+representado por um vetor esparso de gêneros, com peso IDF (gêneros raros
+pesam mais) e norma unitária. A matriz normalizada fica em cache nos dois
+sentidos: por artista (CSR) e por gênero (listas invertidas), de modo que a
+similaridade de cosseno de um artista com todos os outros é uma única soma
+esparsa (bincount) sobre as listas dos gêneros dele.
+
+Para calcular os k mais similares de todos os artistas de uma vez:
+
+    python -m core.similarity --k 10
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.data import DATA_DIR, load_table, read_table
+from core.genres import GenreIndex, load_genres
+from core.metrics import timed
+
+OUTPUT_PATH = DATA_DIR / 'aggregates' / 'similar_artists.csv'
+
+
+def _csr(rows, cols, values, n_rows):
+    """Agrupa triplas (linha, coluna, valor) por linha: (indptr, cols, values)."""
+    order = np.lexsort((cols, rows))
+    indptr = np.r_[0, np.cumsum(np.bincount(rows, minlength=n_rows))]
+    return indptr, cols[order], values[order]
+
+
+class GenreSimilarity:
+    """Matriz artista × gênero normalizada e consultas de similaridade de cosseno."""
+
+    def __init__(self, artists_df, related_df, genres):
+        artist_ids = artists_df['spotify_id'].astype(str).to_numpy()
+        related_ids = related_df['related_artist_id'].astype(str).to_numpy()
+        codes, self.ids = pd.factorize(np.concatenate([artist_ids, related_ids]))
+        artist_nodes, related_nodes = codes[:len(artist_ids)], codes[len(artist_ids):]
+        self.n_artists = len(self.ids)
+        self.node_of = {spotify_id: node for node, spotify_id in enumerate(self.ids)}
+
+        # Nomes: artistas relacionados primeiro, sobrescritos pela tabela de artistas
+        self.names = np.empty(self.n_artists, dtype=object)
+        self.names[related_nodes] = related_df['related_artist_name'].to_numpy()
+        self.names[artist_nodes] = artists_df['artist_name'].to_numpy()
+
+        # Pares (artista, gênero) das duas fontes, sem repetição
+        def pairs(lists, nodes):
+            counts = np.diff(lists.offsets)
+            return np.repeat(nodes, counts), lists.codes
+
+        artist_rows, artist_genres = pairs(genres.artists, artist_nodes)
+        related_rows, related_genres = pairs(genres.related, related_nodes)
+        n_genres = len(genres.vocabulary)
+        keys = np.unique(
+            np.concatenate([artist_rows, related_rows]).astype(np.int64) * n_genres
+            + np.concatenate([artist_genres, related_genres])
+        )
+        rows, cols = keys // n_genres, (keys % n_genres).astype(np.int32)
+
+        # Peso IDF por gênero e normalização L2 de cada artista
+        document_freq = np.bincount(cols, minlength=n_genres)
+        idf = np.log((1 + self.n_artists) / (1 + document_freq)) + 1.0
+        values = idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=self.n_artists))
+        values = values / norms[rows]
+
+        self.genres = genres
+        self.indptr, self.cols, self.values = _csr(rows, cols, values, self.n_artists)
+        self.genre_indptr, self.postings, self.posting_values = _csr(cols, rows, values, n_genres)
+
+    def _scores(self, nodes):
+        """Bloco denso (len(nodes) × n_artists) de similaridades de cosseno."""
+        starts, stops = self.indptr[nodes], self.indptr[nodes + 1]
+        lengths = stops - starts
+        query_pos = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths) + np.arange(lengths.sum())
+        query_row = np.repeat(np.arange(len(nodes)), lengths)
+        query_genre = self.cols[query_pos]
+        query_value = self.values[query_pos]
+
+        # Para cada (consulta, gênero), percorre a lista invertida do gênero
+        g_starts = self.genre_indptr[query_genre]
+        g_lengths = self.genre_indptr[query_genre + 1] - g_starts
+        posting_pos = np.repeat(g_starts - np.r_[0, np.cumsum(g_lengths)[:-1]], g_lengths) + np.arange(g_lengths.sum())
+        block_row = np.repeat(query_row, g_lengths)
+        weight = np.repeat(query_value, g_lengths) * self.posting_values[posting_pos]
+
+        flat = block_row.astype(np.int64) * self.n_artists + self.postings[posting_pos]
+        scores = np.bincount(flat, weights=weight, minlength=len(nodes) * self.n_artists)
+        return scores.reshape(len(nodes), self.n_artists)
+
+    def _top_k(self, nodes, k):
+        """Os k mais similares de cada nó (excluindo ele mesmo): (índices, pontuações)."""
+        scores = self._scores(nodes)
+        scores[np.arange(len(nodes)), nodes] = -1.0
+        k = min(k, self.n_artists - 1)
+        if k <= 0:
+            return np.empty((len(nodes), 0), dtype=int), np.empty((len(nodes), 0))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    @timed('filter')
+    def similar(self, spotify_id, k=10):
+        """Os k artistas mais similares a ``spotify_id`` com similaridade positiva."""
+        node = self.node_of.get(spotify_id)
+        if node is None or self.indptr[node] == self.indptr[node + 1]:
+            return pd.DataFrame({'spotify_id': [], 'artist_name': [], 'similarity': []})
+        top, scores = self._top_k(np.array([node]), k)
+        keep = scores[0] > 0
+        nodes = top[0][keep]
+        return pd.DataFrame({
+            'spotify_id': self.ids[nodes],
+            'artist_name': self.names[nodes],
+            'similarity': scores[0][keep],
+        })
+
+    def all_top_k(self, k=10, batch_size=256):
+        """Os k mais similares de todos os artistas, em blocos de consultas vetorizadas."""
+        frames = []
+        for start in range(0, self.n_artists, batch_size):
+            nodes = np.arange(start, min(start + batch_size, self.n_artists))
+            top, scores = self._top_k(nodes, k)
+            keep = scores > 0
+            frames.append(pd.DataFrame({
+                'spotify_id': self.ids[np.repeat(nodes, top.shape[1])[keep.ravel()]],
+                'similar_id': self.ids[top[keep]],
+                'rank': np.tile(np.arange(1, top.shape[1] + 1), len(nodes))[keep.ravel()],
+                'similarity': scores[keep],
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+
+@st.cache_resource(show_spinner=False)
+def load_similarity():
+    """Índice de similaridade compartilhado pelo processo."""
+    return GenreSimilarity(load_table('artists'), load_table('related_artists'), load_genres())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcula os artistas mais similares por gênero.")
+    parser.add_argument('--k', type=int, default=10, help="quantidade de similares por artista")
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help="arquivo CSV de saída")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    artists_df = read_table('artists')
+    related_df = read_table('related_artists')
+    similarity = GenreSimilarity(artists_df, related_df, GenreIndex(artists_df, related_df))
+    result = similarity.all_top_k(k=args.k)
+    elapsed = time.perf_counter() - start
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    result.to_csv(output, index=False)
+    print(f"{len(result)} pares de {similarity.n_artists} artistas gravados em {output} ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import streamlit as st
 from config import setup_page_config, apply_custom_css
-import pandas as pd
+from core.catalog import load_catalog
+from core.metrics import begin_page, end_page
 
 # Configuração inicial da página (apenas uma vez)
 setup_page_config()
@@ -9,9 +10,9 @@ apply_custom_css()
 # Inicialização do estado da sessão
 if 'selected_artist' not in st.session_state:
     try:
-        artists_df = pd.read_csv('data/artists.csv')
-        st.session_state.selected_artist = sorted(artists_df['artist_name'].unique())[0]
-        st.session_state.selected_artist_id = artists_df[artists_df['artist_name'] == st.session_state.selected_artist]['spotify_id'].iloc[0]
+        catalog = load_catalog()
+        st.session_state.selected_artist = catalog.default
+        st.session_state.selected_artist_id = catalog.ids[catalog.default]
     except Exception as e:
         st.error(f"Erro ao inicializar o estado: {str(e)}")
 
@@ -53,6 +54,12 @@ related_artists_page = st.Page(
     icon="👥"
 )
 
+leaderboards_page = st.Page(
+    "views/leaderboards.py",
+    title="Rankings",
+    icon="🏆"
+)
+
 # Configuração da navegação
 pg = st.navigation([
     home_page,
@@ -60,8 +67,14 @@ pg = st.navigation([
     tracks_page,
     albums_page,
     shows_page,
-    related_artists_page
+    related_artists_page,
+    leaderboards_page
 ])
 
-# Executa a navegação
-pg.run() 
\ No newline at end of file
+# Executa a navegação, medindo o tempo de cada fase da página (ver core/metrics.py);
+# a execução é registrada mesmo se a página parar em st.stop() ou em uma exceção
+begin_page(pg.url_path or 'home')
+try:
+    pg.run()
+finally:
+    end_page() 
\ No newline at end of file
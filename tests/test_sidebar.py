@@ -0,0 +1,49 @@
+"""
+Seletor de artista da barra lateral (core/sidebar.py).
+
+A troca de artista é aplicada pelo callback ``on_change`` do seletor, antes da
+execução da página; uma seleção deve custar exatamente uma execução do script,
+sem ``st.rerun()``. As páginas são executadas sem navegador pelo ``AppTest``
+do Streamlit, como em benchmarks/latency.py, e as execuções são contadas pelas
+chamadas a ``artist_selector``, feitas uma vez no início de cada execução da
+página (antes de um eventual ``st.rerun()`` interrompê-la).
+
+Uso:
+
+    python -m pytest tests
+"""
+from streamlit.testing.v1 import AppTest
+
+import core.sidebar
+from benchmarks import ROOT
+from core.catalog import load_catalog
+
+PAGE = ROOT / 'views' / 'general.py'
+SELECTOR_KEY = 'artist_selector_general'
+
+
+def test_selection_change_runs_page_once(monkeypatch):
+    runs = []
+    artist_selector = core.sidebar.artist_selector
+
+    def counted_artist_selector(*args, **kwargs):
+        runs.append(args)
+        return artist_selector(*args, **kwargs)
+
+    monkeypatch.setattr(core.sidebar, 'artist_selector', counted_artist_selector)
+
+    at = AppTest.from_file(str(PAGE), default_timeout=120)
+    at.run()
+    assert not at.exception
+    assert len(runs) == 1
+
+    selectbox = at.sidebar.selectbox(key=SELECTOR_KEY)
+    target = next(option for option in selectbox.options if option != selectbox.value)
+
+    runs.clear()
+    selectbox.select(target).run()
+
+    assert not at.exception
+    assert len(runs) == 1
+    assert at.session_state['selected_artist'] == target
+    assert at.session_state['selected_artist_id'] == load_catalog().ids[target]
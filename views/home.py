@@ -1,44 +1,19 @@
 import streamlit as st
-from config import COLORS, apply_custom_css
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from config import apply_custom_css
+from core.data import load_data
+from core.sidebar import artist_selector
 
 # Aplica o CSS personalizado
 apply_custom_css()
 
-# Carregamento dos dados
-@st.cache_data
-def load_data():
-    try:
-        artists_df = pd.read_csv('data/artists.csv')
-        return artists_df
-    except Exception as e:
-        st.error(f"Erro ao carregar os dados: {str(e)}")
-        return None
-
 # Carrega os dados
-artists_df = load_data()
+artists_df = load_data('artists')[0]
 
 if artists_df is None:
     st.stop()
 
 # Sidebar - Seleção do artista
-st.sidebar.markdown("### Procure seu artista favorito")
-selected_artist = st.sidebar.selectbox(
-    "Artista",
-    options=sorted(artists_df['artist_name'].unique()),
-    index=sorted(artists_df['artist_name'].unique()).index(st.session_state.get('selected_artist', sorted(artists_df['artist_name'].unique())[0])) if 'selected_artist' in st.session_state else 0,
-    key="artist_selector",
-    label_visibility="collapsed"
-)
-
-# Atualiza o estado da sessão apenas se o artista selecionado mudou
-if selected_artist != st.session_state.get('selected_artist'):
-    st.session_state.selected_artist = selected_artist
-    st.session_state.selected_artist_id = artists_df[artists_df['artist_name'] == selected_artist]['spotify_id'].iloc[0]
-    st.session_state.artists_df = artists_df
-    st.rerun()
+selected_artist = artist_selector("artist_selector")
 
 # Conteúdo principal
 st.markdown("""
@@ -64,6 +39,7 @@ st.markdown("""
     * 💿 **Álbuns**: Detalhes sobre cada álbum lançado
     * 🎭 **Shows**: Agenda de shows futuros e histórico de apresentações
     * 👥 **Artistas Relacionados**: Descubra artistas similares que você pode gostar
+    * 🏆 **Rankings**: Os artistas que mais se destacam em todo o catálogo
     
     #### Como usar:
     
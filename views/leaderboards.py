@@ -0,0 +1,71 @@
+import streamlit as st
+from config import apply_custom_css
+from core.data import load_data
+from core.sidebar import artist_selector
+from core.leaderboards import MIN_TRACKS, leaderboard
+
+# Aplica o CSS personalizado
+apply_custom_css()
+
+# Carrega os dados
+artists_df = load_data('artists')[0]
+
+if artists_df is None:
+    st.stop()
+
+# Sidebar - Seleção do artista
+selected_artist = artist_selector("artist_selector_leaderboards")
+
+st.markdown("<h1 style='color: white;'>🏆 Rankings do Catálogo</h1>", unsafe_allow_html=True)
+
+
+def show_leaderboard(board, value_label, value_format='%d'):
+    """Exibe um ranking como tabela, com a posição de cada artista."""
+    if board.empty:
+        st.info("Não há dados suficientes para este ranking.")
+        return
+    table = board[['artist_name', 'value']].rename(columns={'artist_name': 'Artista', 'value': value_label})
+    table.insert(0, 'Posição', range(1, len(table) + 1))
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={value_label: st.column_config.NumberColumn(format=value_format)}
+    )
+
+
+touring_tab, countries_tab, decades_tab, popularity_tab, connected_tab = st.tabs([
+    "🎭 Mais Shows",
+    "🌍 Mais Países",
+    "💿 Lançamentos por Década",
+    "🎵 Popularidade Média",
+    "👥 Mais Conectados",
+])
+
+with touring_tab:
+    st.write("### Artistas com mais shows")
+    show_leaderboard(leaderboard('touring'), 'Shows')
+
+with countries_tab:
+    st.write("### Artistas que tocaram em mais países")
+    show_leaderboard(leaderboard('countries'), 'Países')
+
+with decades_tab:
+    st.write("### Artistas com mais lançamentos por década")
+    decades = leaderboard('decades')
+    if decades.empty:
+        st.info("Não há dados suficientes para este ranking.")
+    else:
+        options = sorted(decades['decade'].unique(), reverse=True)
+        decade = st.selectbox("Década", options, format_func=lambda d: f"{int(d)}s", key="leaderboard_decade")
+        show_leaderboard(decades[decades['decade'] == decade], 'Lançamentos')
+
+with popularity_tab:
+    st.write("### Maior popularidade média das músicas")
+    st.caption(f"Apenas artistas com pelo menos {MIN_TRACKS} músicas.")
+    show_leaderboard(leaderboard('popularity'), 'Popularidade Média', '%.1f')
+
+with connected_tab:
+    st.write("### Artistas mais conectados no grafo de relacionados")
+    st.caption("Ligações: artistas que o citam como relacionado e que ele cita.")
+    show_leaderboard(leaderboard('connected'), 'Ligações')
@@ -1,310 +1,350 @@
 import streamlit as st
 import pandas as pd
 from config import COLORS, apply_custom_css
-import plotly.express as px
+from core.data import load_data
+from core.catalog import artist_record
+from core.sidebar import artist_selector
+from core.header import artist_header
+from core.index import artist_rows
+from core.aggregates import artist_aggregate
+from core.genres import related_genre_counts, related_main_genres
+from core.graph import load_graph
+from core.figures import cached_figure, show_figure
+from core.metrics import measured_fragment
+from core.boxplot import box_figure
+from core.histogram import histogram_bins, histogram_figure
 
 # Aplica o CSS personalizado
 apply_custom_css()
 
-# Carregamento dos dados
-@st.cache_data
-def load_data():
-    try:
-        artists_df = pd.read_csv('data/artists.csv')
-        related_df = pd.read_csv('data/related_artists.csv')
-        
-        # Padroniza os nomes dos artistas
-        artists_df['artist_name'] = artists_df['artist_name'].apply(lambda x: x.title() if pd.notna(x) else x)
-        related_df['related_artist_name'] = related_df['related_artist_name'].apply(lambda x: x.title() if pd.notna(x) else x)
-        
-        return artists_df, related_df
-    except Exception as e:
-        st.error(f"Erro ao carregar os dados: {str(e)}")
-        return None, None
-
 # Carrega os dados
-artists_df, related_df = load_data()
+artists_df = load_data('artists')[0]
 
 if artists_df is None:
     st.stop()
 
 # Sidebar - Seleção do artista
-st.sidebar.markdown("### Procure seu artista favorito")
-selected_artist = st.sidebar.selectbox(
-    "Artista",
-    options=sorted(artists_df['artist_name'].unique()),
-    index=sorted(artists_df['artist_name'].unique()).index(st.session_state.get('selected_artist', sorted(artists_df['artist_name'].unique())[0])) if 'selected_artist' in st.session_state else 0,
-    key="artist_selector_related",
-    label_visibility="collapsed"
-)
-
-# Atualiza o estado da sessão apenas se o artista selecionado mudou
-if selected_artist != st.session_state.get('selected_artist'):
-    st.session_state.selected_artist = selected_artist
-    st.session_state.selected_artist_id = artists_df[artists_df['artist_name'] == selected_artist]['spotify_id'].iloc[0]
-    st.rerun()
-
-# Cabeçalho
-artist_data = artists_df[artists_df['artist_name'] == selected_artist].iloc[0]
+selected_artist = artist_selector("artist_selector_related")
 
 # Cabeçalho com foto e nome
-col1, col2 = st.columns([1, 9])
-
-with col1:
-    image_url = artist_data['image_url'] if pd.notna(artist_data['image_url']) else 'https://via.placeholder.com/100x100?text=No+Image'
-    st.markdown(f"""
-    <div style='display: flex; justify-content: flex-start; margin-bottom: 1rem;'>
-        <img src='{image_url}' style='border-radius: 10px; object-fit: cover; object-position: center; width: 100px; height: 100px;'>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"""
-        <div style='display: flex; align-items: center; margin-bottom: 2rem; margin-top: 10px;'>
-            <h2 style='color: white; margin-bottom: 0;'>{selected_artist}</h2>
-            <a href='{artist_data['spotify_url']}' target='_blank' style='margin-left: -20px; text-decoration: none;'>
-                <img src='https://upload.wikimedia.org/wikipedia/commons/1/19/Spotify_logo_without_text.svg' width='20'>
-            </a>
-        </div>
-    """, unsafe_allow_html=True)
+artist_header()
+
+artist_data = artist_record(selected_artist)
 
 # Artistas relacionados
-related_artists = related_df[related_df['spotify_id'] == st.session_state.selected_artist_id].copy()
+related_artists = artist_rows('related_artists', st.session_state.selected_artist_id)
 
 if not related_artists.empty:
     st.write("### Artistas Relacionados")
 
-    # Filtra os artistas relacionados ao artista selecionado
-    related_artists_data = related_df[related_df['spotify_id'] == st.session_state.selected_artist_id].copy()
-
-    if not related_artists_data.empty:
-        # Layout em duas colunas para métricas
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            avg_popularity = related_artists_data['related_artist_popularity'].mean()
-            st.metric("Popularidade Média", f"{avg_popularity:.1f}")
-        
-        with col2:
-            unique_genres = related_artists_data['related_artist_genres'].str.split(', ').explode().nunique()
-            st.metric("Gêneros Únicos", unique_genres)
+    # Layout em duas colunas para métricas
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        avg_popularity = related_artists['related_artist_popularity'].mean()
+        st.metric("Popularidade Média", f"{avg_popularity:.1f}")
+    
+    with col2:
+        unique_genres = len(related_genre_counts(st.session_state.selected_artist_id))
+        st.metric("Gêneros Únicos", unique_genres)
 
-        # 1. COMPARAÇÃO DE POPULARIDADE
+    # 1. COMPARAÇÃO DE POPULARIDADE
+    @measured_fragment
+    def comparison_section():
         st.write("### 🏆 Comparação de Popularidade")
-        
+    
         # Obter dados do artista principal
-        main_artist_data = artists_df[artists_df['spotify_id'] == st.session_state.selected_artist_id].iloc[0]
-        
+        main_artist_data = artist_data
+    
         # Top 15 artistas relacionados por popularidade
-        top_related = related_artists_data.nlargest(15, 'related_artist_popularity')
-        
+        top_related = related_artists.nlargest(15, 'related_artist_popularity')
+    
         # Adicionar o artista principal para comparação
         comparison_data = []
         comparison_data.append({
             'artist_name': f"{main_artist_data['artist_name']} (Principal)",
             'popularity': main_artist_data['popularity']
         })
-        
+    
         for _, artist in top_related.iterrows():
             comparison_data.append({
                 'artist_name': artist['related_artist_name'],
                 'popularity': artist['related_artist_popularity']
             })
-        
+    
         comparison_df = pd.DataFrame(comparison_data)
-        
+    
         # Gráfico de barras comparativo
-        fig_comparison = px.bar(
-            comparison_df,
-            x='popularity',
-            y='artist_name',
-            orientation='h',
-            title=f'Comparação de Popularidade: {selected_artist} vs Artistas Relacionados',
-            labels={'popularity': 'Popularidade', 'artist_name': 'Artista'},
-            color='popularity',
-            color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
-            height=600
-        )
-        fig_comparison.update_layout(
-            yaxis={'categoryorder': 'total ascending'},
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font_color='white',
-            showlegend=False
-        )
-        st.plotly_chart(fig_comparison, use_container_width=True)
-
-        # 2. ANÁLISE DE GÊNEROS MUSICAIS
+        def build_fig_comparison():
+            import plotly.express as px
+
+            fig_comparison = px.bar(
+                comparison_df,
+                x='popularity',
+                y='artist_name',
+                orientation='h',
+                title=f'Comparação de Popularidade: {selected_artist} vs Artistas Relacionados',
+                labels={'popularity': 'Popularidade', 'artist_name': 'Artista'},
+                color='popularity',
+                color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                height=600
+            )
+            fig_comparison.update_layout(
+                yaxis={'categoryorder': 'total ascending'},
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font_color='white',
+                showlegend=False
+            )
+            return fig_comparison
+
+        fig_comparison = cached_figure(st.session_state.selected_artist_id, 'related_artists_comparison', build_fig_comparison)
+        show_figure(fig_comparison)
+
+    comparison_section()
+
+    # 2. ANÁLISE DE GÊNEROS MUSICAIS
+    @measured_fragment
+    def genres_section():
         st.write("### 🎵 Análise de Gêneros Musicais")
+    
+        # Contagem de gêneros (tabela de gêneros normalizada no carregamento)
+        genre_counts = related_genre_counts(st.session_state.selected_artist_id).head(15)
+    
+        if not genre_counts.empty:
         
-        # Extrair e contar gêneros
-        all_genres = []
-        for genres_str in related_artists_data['related_artist_genres'].dropna():
-            if genres_str and genres_str != '':
-                genres_list = [genre.strip() for genre in genres_str.split(',')]
-                all_genres.extend(genres_list)
-        
-        if all_genres:
-            genre_counts = pd.Series(all_genres).value_counts().head(15)
-            
             col1, col2 = st.columns(2)
-            
+        
             with col1:
                 # Top gêneros - gráfico de barras
-                fig_genres = px.bar(
-                    x=genre_counts.values,
-                    y=genre_counts.index,
-                    orientation='h',
-                    title='Top 15 Gêneros Musicais',
-                    labels={'x': 'Frequência', 'y': 'Gênero'},
-                    color=genre_counts.values,
-                    color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                def build_fig_genres():
+                    import plotly.express as px
+
+                    fig_genres = px.bar(
+                        x=genre_counts.values,
+                        y=genre_counts.index,
+                        orientation='h',
+                        title='Top 15 Gêneros Musicais',
+                        labels={'x': 'Frequência', 'y': 'Gênero'},
+                        color=genre_counts.values,
+                        color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                        height=400,
+                        width=470
+                    )
+                    fig_genres.update_layout(
+                        yaxis={'categoryorder': 'total ascending'},
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        font_color='white',
+                        showlegend=False
+                    )
+                    return fig_genres
+
+                fig_genres = cached_figure(st.session_state.selected_artist_id, 'related_artists_genres', build_fig_genres)
+                show_figure(fig_genres, use_container_width=False)
+        
+            with col2:
+                # Substituir pizza por barras horizontais - Top 10 Gêneros
+                top_10_genres = genre_counts.head(10)
+                def build_fig_bar_genres():
+                    import plotly.express as px
+
+                    fig_bar_genres = px.bar(
+                        x=top_10_genres.values,
+                        y=top_10_genres.index,
+                        orientation='h',
+                        title='Top 10 Gêneros - Distribuição',
+                        labels={'x': 'Frequência', 'y': 'Gênero'},
+                        color=top_10_genres.values,
+                        color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                        height=400,
+                        width=470
+                    )
+                    fig_bar_genres.update_layout(
+                        yaxis={'categoryorder': 'total ascending'},
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        font_color='white',
+                        showlegend=False
+                    )
+                    return fig_bar_genres
+
+                fig_bar_genres = cached_figure(st.session_state.selected_artist_id, 'related_artists_bar_genres', build_fig_bar_genres)
+                show_figure(fig_bar_genres, use_container_width=False)
+
+    genres_section()
+
+    # 3. DISTRIBUIÇÃO DE POPULARIDADE DOS ARTISTAS RELACIONADOS
+    @measured_fragment
+    def popularity_section():
+        st.write("### 📊 Distribuição de Popularidade")
+    
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            # Histograma de popularidade
+            def build_fig_hist():
+                fig_hist = histogram_figure(
+                    histogram_bins(related_artists['related_artist_popularity'], nbins=15),
+                    'Popularidade',
+                    'Número de Artistas',
+                    '#00a8b5',
+                    title='Distribuição de Popularidade dos Artistas Relacionados',
                     height=400,
                     width=470
                 )
-                fig_genres.update_layout(
-                    yaxis={'categoryorder': 'total ascending'},
+                fig_hist.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
                     plot_bgcolor='rgba(0,0,0,0)',
-                    font_color='white',
-                    showlegend=False
+                    font_color='white'
                 )
-                st.plotly_chart(fig_genres, use_container_width=False)
-            
-            with col2:
-                # Substituir pizza por barras horizontais - Top 10 Gêneros
-                top_10_genres = genre_counts.head(10)
-                fig_bar_genres = px.bar(
-                    x=top_10_genres.values,
-                    y=top_10_genres.index,
-                    orientation='h',
-                    title='Top 10 Gêneros - Distribuição',
-                    labels={'x': 'Frequência', 'y': 'Gênero'},
-                    color=top_10_genres.values,
-                    color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                return fig_hist
+
+            fig_hist = cached_figure(st.session_state.selected_artist_id, 'related_artists_hist', build_fig_hist)
+            show_figure(fig_hist, use_container_width=False)
+    
+        with col2:
+            # Box plot estatístico
+            # Quartis e valores atípicos pré-calculados
+            box = artist_aggregate('related_box', st.session_state.selected_artist_id)
+            outliers = artist_aggregate('related_outliers', st.session_state.selected_artist_id)
+
+            def build_fig_box():
+                fig_box = box_figure(
+                    box.iloc[0] if not box.empty else None,
+                    outliers,
+                    'Popularidade',
+                    '#a02570',
+                    title='Análise Estatística da Popularidade',
                     height=400,
                     width=470
                 )
-                fig_bar_genres.update_layout(
-                    yaxis={'categoryorder': 'total ascending'},
+                fig_box.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
                     plot_bgcolor='rgba(0,0,0,0)',
                     font_color='white',
                     showlegend=False
                 )
-                st.plotly_chart(fig_bar_genres, use_container_width=False)
+                return fig_box
 
-        # 3. DISTRIBUIÇÃO DE POPULARIDADE DOS ARTISTAS RELACIONADOS
-        st.write("### 📊 Distribuição de Popularidade")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Histograma de popularidade
-            fig_hist = px.histogram(
-                related_artists_data,
-                x='related_artist_popularity',
-                nbins=15,
-                title='Distribuição de Popularidade dos Artistas Relacionados',
-                labels={'related_artist_popularity': 'Popularidade', 'count': 'Número de Artistas'},
-                color_discrete_sequence=['#00a8b5'],
-                height=400,
-                width=470
-            )
-            fig_hist.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font_color='white'
-            )
-            st.plotly_chart(fig_hist, use_container_width=False)
-        
-        with col2:
-            # Box plot estatístico
-            fig_box = px.box(
-                related_artists_data,
-                y='related_artist_popularity',
-                title='Análise Estatística da Popularidade',
-                labels={'related_artist_popularity': 'Popularidade'},
-                color_discrete_sequence=['#a02570'],
-                height=400,
-                width=470
-            )
-            fig_box.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font_color='white',
-                showlegend=False
-            )
-            st.plotly_chart(fig_box, use_container_width=False)
+            fig_box = cached_figure(st.session_state.selected_artist_id, 'related_artists_box', build_fig_box)
+            show_figure(fig_box, use_container_width=False)
 
-        # 4. ANÁLISE DE CATEGORIAS DE POPULARIDADE
+    popularity_section()
+
+    # 4. ANÁLISE DE CATEGORIAS DE POPULARIDADE
+    @measured_fragment
+    def bands_section():
         st.write("### 🎯 Categorias de Popularidade")
-        
-        # Categorizar artistas por popularidade
-        def categorize_popularity(pop):
-            if pop >= 60:
-                return "Muito Popular (60+)"
-            elif pop >= 40:
-                return "Popular (40-59)"
-            elif pop >= 20:
-                return "Moderado (20-39)"
-            else:
-                return "Emergente (0-19)"
-        
-        related_artists_data['categoria'] = related_artists_data['related_artist_popularity'].apply(categorize_popularity)
-        category_counts = related_artists_data['categoria'].value_counts()
-        
+    
+        # Contagem por categoria de popularidade (agregado pré-calculado)
+        bands = artist_aggregate('related_bands', st.session_state.selected_artist_id)
+        category_counts = pd.Series(bands['count'].to_numpy(), index=bands['category'].astype(str))
+    
         col1, col2 = st.columns(2)
-        
+    
         with col1:
             # Substituir pizza por barras horizontais - Categorias de Popularidade
-            fig_categories = px.bar(
-                x=category_counts.values,
-                y=category_counts.index,
-                orientation='h',
-                title='Distribuição por Categoria de Popularidade',
-                labels={'x': 'Número de Artistas', 'y': 'Categoria'},
-                color=category_counts.values,
-                color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
-                height=400,
-                width=500
-            )
-            fig_categories.update_layout(
-                yaxis={'categoryorder': 'total ascending'},
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font_color='white',
-                showlegend=False
-            )
-            st.plotly_chart(fig_categories, use_container_width=False)
-        
+            def build_fig_categories():
+                import plotly.express as px
+
+                fig_categories = px.bar(
+                    x=category_counts.values,
+                    y=category_counts.index,
+                    orientation='h',
+                    title='Distribuição por Categoria de Popularidade',
+                    labels={'x': 'Número de Artistas', 'y': 'Categoria'},
+                    color=category_counts.values,
+                    color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                    height=400,
+                    width=500
+                )
+                fig_categories.update_layout(
+                    yaxis={'categoryorder': 'total ascending'},
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='white',
+                    showlegend=False
+                )
+                return fig_categories
+
+            fig_categories = cached_figure(st.session_state.selected_artist_id, 'related_artists_categories', build_fig_categories)
+            show_figure(fig_categories, use_container_width=False)
+    
         with col2:
             # Scatter plot: relacionar gêneros com popularidade
-            # Pegar um gênero principal para cada artista
-            related_artists_data['main_genre'] = related_artists_data['related_artist_genres'].str.split(',').str[0]
-            genre_popularity = related_artists_data.groupby('main_genre')['related_artist_popularity'].agg(['mean', 'count']).reset_index()
+            # Gênero principal (o primeiro da lista) de cada artista
+            genre_popularity = related_main_genres(st.session_state.selected_artist_id)
             genre_popularity = genre_popularity[genre_popularity['count'] >= 2]  # Apenas gêneros com 2+ artistas
-            
+        
             if not genre_popularity.empty:
-                fig_genre_pop = px.scatter(
-                    genre_popularity,
-                    x='count',
-                    y='mean',
-                    size='count',
-                    hover_data=['main_genre'],
-                    title='Popularidade Média por Gênero (min. 2 artistas)',
-                    labels={'count': 'Número de Artistas', 'mean': 'Popularidade Média'},
-                    color='mean',
-                    color_continuous_scale=[[0, '#00a8b5'], [0.5, COLORS['accent']], [1, '#a02570']],
-                    height=400,
-                    width=500
+                def build_fig_genre_pop():
+                    import plotly.express as px
+
+                    fig_genre_pop = px.scatter(
+                        genre_popularity,
+                        x='count',
+                        y='mean',
+                        size='count',
+                        hover_data=['main_genre'],
+                        title='Popularidade Média por Gênero (min. 2 artistas)',
+                        labels={'count': 'Número de Artistas', 'mean': 'Popularidade Média'},
+                        color='mean',
+                        color_continuous_scale=[[0, '#00a8b5'], [0.5, COLORS['accent']], [1, '#a02570']],
+                        height=400,
+                        width=500
+                    )
+                    fig_genre_pop.update_layout(
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        font_color='white'
+                    )
+                    return fig_genre_pop
+
+                fig_genre_pop = cached_figure(st.session_state.selected_artist_id, 'related_artists_genre_pop', build_fig_genre_pop)
+                show_figure(fig_genre_pop, use_container_width=False)
+
+    bands_section()
+
+    # 5. DESCUBRA MAIS: ARTISTAS A 2 E 3 SALTOS NO GRAFO DE RELACIONADOS
+    @measured_fragment
+    def discover_section():
+        st.write("### 🔭 Descubra Mais")
+    
+        # Recomendações além dos relacionados diretos, ponderadas por popularidade
+        discoveries = load_graph().discover(st.session_state.selected_artist_id, limit=15)
+    
+        if not discoveries.empty:
+            def build_fig_discover():
+                import plotly.express as px
+
+                fig_discover = px.bar(
+                    discoveries,
+                    x='score',
+                    y='artist_name',
+                    orientation='h',
+                    title='Artistas Recomendados (relacionados dos relacionados)',
+                    labels={'score': 'Afinidade', 'artist_name': 'Artista', 'hop': 'Distância', 'popularity': 'Popularidade', 'centrality': 'Centralidade'},
+                    hover_data={'hop': True, 'popularity': True, 'score': ':.3f', 'centrality': ':.4f'},
+                    color='score',
+                    color_continuous_scale=[[0, COLORS['highlight']], [0.5, COLORS['accent']], [1, COLORS['accent2']]],
+                    height=500
                 )
-                fig_genre_pop.update_layout(
+                fig_discover.update_layout(
+                    yaxis={'categoryorder': 'total ascending'},
                     paper_bgcolor='rgba(0,0,0,0)',
                     plot_bgcolor='rgba(0,0,0,0)',
-                    font_color='white'
+                    font_color='white',
+                    showlegend=False
                 )
-                st.plotly_chart(fig_genre_pop, use_container_width=False)
+                return fig_discover
+
+            fig_discover = cached_figure(st.session_state.selected_artist_id, 'related_artists_discover', build_fig_discover)
+            show_figure(fig_discover)
+        else:
+            st.info("Nenhum artista encontrado além dos relacionados diretos.")
+
+    discover_section()
 
 else:
     st.info("Não há artistas relacionados disponíveis para este artista.") 
\ No newline at end of file